@@ -0,0 +1,207 @@
+"""
+Times working out the live scoring events for increasing numbers of players whose points changed since the last
+refresh, evaluating every scoring rule in one pass against filtering the players for each rule in turn and
+concatenating the results
+
+    python benchmarks/activity.py
+"""
+
+import os
+import random
+import sys
+import timeit
+from datetime import datetime
+
+import polars as pl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("FPL_STORE_PATH", ":memory:")
+
+from fpl.data.api import latest_player_activity
+from fpl.data.config import CLEAN_SHEET_POINTS, GOALS_POINTS
+from fpl.data.schemas import LiveStats
+
+POSITIONS = ("Goalkeeper", "Defender", "Midfielder", "Forward")
+
+# scoring rules as a filter for the players each event happened to, which emit one event per player so only
+# match the rules in the app while each stat goes up by at most one between refreshes
+PER_RULE_SCORING_CONFIG = (
+    {
+        "filter": (pl.col("stats.clean_sheets").gt(pl.col("stats.clean_sheets_cache"))) & (pl.col("position_name").is_in(CLEAN_SHEET_POINTS.keys())),
+        "event": "Clean Sheet",
+        "badge_colour": "green",
+        "points": pl.col("position_name").replace_strict(CLEAN_SHEET_POINTS).alias("points")
+    },
+    {
+        "filter": pl.col("stats.goals_scored").gt(pl.col("stats.goals_scored_cache")),
+        "event": "Goal Scored",
+        "badge_colour": "green",
+        "points": pl.col("position_name").replace_strict(GOALS_POINTS).alias("points")
+    },
+    {
+        "filter": pl.col("stats.assists").gt(pl.col("stats.assists_cache")),
+        "event": "Goal Assisted",
+        "badge_colour": "green",
+        "points": 3
+    },
+    {
+        "filter": pl.col("stats.penalties_missed").gt(pl.col("stats.penalties_missed_cache")),
+        "event": "Penalty Missed",
+        "badge_colour": "red",
+        "points": -2
+    },
+    {
+        "filter": pl.col("stats.own_goals").gt(pl.col("stats.own_goals_cache")),
+        "event": "Own Goal Scored",
+        "badge_colour": "red",
+        "points": -2
+    },
+    {
+        "filter": (pl.col("stats.clean_sheets").lt(pl.col("stats.clean_sheets_cache")) & (pl.col("position_name").is_in(CLEAN_SHEET_POINTS.keys()))),
+        "event": "Lost Clean Sheet",
+        "badge_colour": "red",
+        "points": pl.col("position_name").replace_strict(CLEAN_SHEET_POINTS).mul(-1).alias("points")
+    },
+    {
+        "filter": (pl.col("stats.saves").gt(pl.col("stats.saves_cache"))) & (pl.col("stats.saves").mod(3).eq(0)),
+        "event": "3 Shots Saved",
+        "badge_colour": "green",
+        "points": 1
+    },
+    {
+        "filter": (pl.col("stats.goals_conceded").gt(pl.col("stats.goals_conceded_cache"))) & (pl.col("stats.goals_conceded").mod(2).eq(0)),
+        "event": "2 Goals Conceded",
+        "badge_colour": "red",
+        "points": -1
+    },
+    {
+        "filter": pl.col("stats.penalties_saved").gt(pl.col("stats.penalties_saved_cache")),
+        "event": "Penalty Saved",
+        "badge_colour": "green",
+        "points": 5
+    },
+    {
+        "filter": pl.col("stats.yellow_cards").gt(pl.col("stats.yellow_cards_cache")),
+        "event": "Yellow Card",
+        "badge_colour": "red",
+        "points": -1
+    },
+    {
+        "filter": pl.col("stats.red_cards").gt(pl.col("stats.red_cards_cache")),
+        "event": "Red Card",
+        "badge_colour": "red",
+        "points": -3
+    },
+    {
+        "filter": pl.col("stats.bonus").gt(pl.col("stats.bonus_cache")),
+        "event": "Bonus",
+        "badge_colour": "green",
+        "points": pl.col("stats.bonus").alias("points")
+    },
+)
+
+
+def snapshots(players: int, seed: int = 0) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Returns previous and latest points for the players, with every player's points changed and each stat going up
+    by at most one, apart from clean sheets which can also be lost
+    """
+
+    rng = random.Random(seed)
+
+    players_df = pl.DataFrame({
+        "player_id": range(players),
+        "web_name": [f"Player {i}" for i in range(players)],
+        "position_name": [rng.choice(POSITIONS) for _ in range(players)],
+        "team_name": [f"Team {rng.randrange(20)}" for _ in range(players)],
+        "img_url": [f"{i}.png" for i in range(players)],
+    })
+
+    previous = {f"stats.{stat}": [rng.randrange(4) for _ in range(players)] for stat in LiveStats.__struct_fields__}
+    latest = {col: [value + rng.choice((0, 0, 0, 1)) for value in values] for col, values in previous.items()}
+    latest["stats.clean_sheets"] = [max(value + rng.choice((-1, 0, 0, 1)), 0) for value in previous["stats.clean_sheets"]]
+    latest["stats.total_points"] = [value + 1 for value in previous["stats.total_points"]]
+
+    return pl.DataFrame(previous).with_columns(players_df["player_id"]), players_df.hstack(pl.DataFrame(latest))
+
+
+def per_rule(cache: pl.DataFrame, unique_player_points: pl.DataFrame, event_id: int) -> pl.DataFrame | None:
+    """
+    Returns the latest events for players whose points have changed since the last refresh, filtering the players
+    for each scoring rule in turn
+    """
+
+    col_map = {
+        "position_name": "position",
+        "stats.total_points": "total_points",
+        "team_name": "team",
+        "web_name": "player",
+    }
+
+    return_fields = (
+        "id",
+        "event",
+        "badge_colour",
+        "img_url",
+        "player",
+        "points",
+        "position",
+        "team",
+        "time",
+        "total_points",
+    )
+
+    event_time = datetime.now()
+
+    points_diff = (
+        unique_player_points
+        .join(cache, on="player_id", suffix="_cache")
+        .sort("team_name", "web_name", descending=True)
+        .filter(pl.col("stats.total_points") != pl.col("stats.total_points_cache"))
+    )
+
+    activity_dfs: list[pl.DataFrame] = []
+
+    for config in PER_RULE_SCORING_CONFIG:
+        df = points_diff.filter(config["filter"])
+
+        if not df.is_empty():
+            df = df.with_columns(event=pl.lit(config["event"]), badge_colour=pl.lit(config["badge_colour"]))
+
+            if isinstance(config["points"], int):
+                df = df.with_columns(points=pl.lit(config["points"]))
+            else:
+                df = df.with_columns(config["points"])
+
+            activity_dfs.append(df.with_columns(pl.col("points").cast(pl.Int64)))
+
+    if not activity_dfs:
+        return None
+
+    activity_df = pl.concat(activity_dfs)
+    activity_df = activity_df.with_columns(time=pl.lit(event_time.strftime("%H:%M")))
+    activity_df = activity_df.with_columns(pl.arange(event_id, event_id+activity_df.height).alias("id"))
+
+    return (
+        activity_df
+        .rename(col_map)
+        .select(return_fields)
+    )
+
+
+def main():
+    for players in (50, 300, 700):
+        cache_df, latest_df = snapshots(players)
+        events = latest_player_activity(cache_df, latest_df, 0).height
+
+        print(f"{players:>4} players {events:>5} events")
+
+        for activity in (per_rule, latest_player_activity):
+            runs = 50
+            secs = timeit.timeit(lambda: activity(cache_df, latest_df, 0), number=runs) / runs
+
+            print(f"{activity.__name__:>24} {secs * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
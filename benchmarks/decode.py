@@ -0,0 +1,90 @@
+"""
+Times turning a full gameweek live response into the player points frame, decoding the json with msgspec into
+typed structs and building columns from them, against parsing it into dicts and flattening them with polars
+
+    python benchmarks/decode.py
+"""
+
+import json
+import os
+import random
+import sys
+import timeit
+
+import msgspec
+import polars as pl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("FPL_STORE_PATH", ":memory:")
+
+from fpl.data.schemas import Live, LiveStats, live_to_frame
+
+# stats in the response which the app doesn't read
+UNUSED_STATS = {
+    "bps": 0,
+    "creativity": "0.0",
+    "expected_assists": "0.00",
+    "expected_goals": "0.00",
+    "ict_index": "0.0",
+    "in_dreamteam": False,
+    "influence": "0.0",
+    "starts": 0,
+    "threat": "0.0",
+}
+
+
+def live_response(players: int = 800, seed: int = 0) -> bytes:
+    """
+    Returns a live response for the players with a stats and explain block each, like the api's
+    """
+
+    rng = random.Random(seed)
+
+    elements = [
+        {
+            "id": player_id,
+            "stats": {name: rng.randrange(4) for name in LiveStats.__struct_fields__} | UNUSED_STATS,
+            "explain": [
+                {
+                    "fixture": rng.randrange(1, 380),
+                    "stats": [
+                        {"identifier": "minutes", "points": 2, "value": 90},
+                        {"identifier": "goals_scored", "points": 5, "value": 1},
+                    ]
+                }
+            ],
+            "modified": False,
+        }
+        for player_id in range(1, players + 1)
+    ]
+
+    return json.dumps({"elements": elements}).encode()
+
+
+def dicts(content: bytes) -> pl.DataFrame:
+    return (
+        pl.json_normalize(json.loads(content)["elements"])
+        .select("id", *(f"stats.{name}" for name in LiveStats.__struct_fields__))
+    )
+
+
+def structs(content: bytes) -> pl.DataFrame:
+    return live_to_frame(msgspec.json.decode(content, type=Live))
+
+
+def main():
+    content = live_response()
+
+    assert dicts(content).equals(structs(content))
+
+    print(f"live response of {len(content) / 1024:.0f} KiB")
+
+    for parse in (dicts, structs):
+        runs = 50
+        secs = timeit.timeit(lambda: parse(content), number=runs) / runs
+
+        print(f"{parse.__name__:>8} {secs * 1e3:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Times enriching the picks of a league with live points and player columns, gathering rows from a dense index by
+player id against the hash joins it replaced
+
+    python benchmarks/lookup.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+import polars as pl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("FPL_STORE_PATH", ":memory:")
+
+from fpl.data.lookup import DenseIndex
+
+
+def players(count: int = 800, seed: int = 0) -> pl.DataFrame:
+    """
+    Returns player columns like the reference data's
+    """
+
+    rng = random.Random(seed)
+
+    return pl.DataFrame({
+        "player_id": list(range(1, count + 1)),
+        "web_name": [f"Player {player_id}" for player_id in range(1, count + 1)],
+        "team_id": [rng.randrange(1, 21) for _ in range(count)],
+        "team_name": [f"Team {rng.randrange(1, 21)}" for _ in range(count)],
+        "position_name": [rng.choice(("Goalkeeper", "Defender", "Midfielder", "Forward")) for _ in range(count)],
+        "img_url": [f"https://example.com/p{player_id}.png" for player_id in range(1, count + 1)],
+    })
+
+
+def player_points(count: int = 800, seed: int = 0) -> pl.DataFrame:
+    """
+    Returns live total points for each player like the poller's
+    """
+
+    rng = random.Random(seed)
+
+    return pl.DataFrame({
+        "player_id": list(range(1, count + 1)),
+        "stats.total_points": [rng.randrange(-2, 20) for _ in range(count)],
+    })
+
+
+def picks(entries: int = 500, players: int = 800, seed: int = 0) -> pl.DataFrame:
+    """
+    Returns the fifteen picks of each entry in a league
+    """
+
+    rng = random.Random(seed)
+
+    rows = [
+        (entry_id, player_id, position, 2 if position == 1 else int(position < 12))
+        for entry_id in range(1, entries + 1)
+        for position, player_id in enumerate(rng.sample(range(1, players + 1), 15), start=1)
+    ]
+
+    return pl.DataFrame(rows, schema=["entry_id", "player_id", "position", "multiplier"], orient="row")
+
+
+def main():
+    picks_df = picks()
+
+    cases = (
+        ("live points", player_points().select(("player_id", "stats.total_points"))),
+        ("player columns", players()),
+    )
+
+    print(f"{picks_df['entry_id'].n_unique()} entries, {picks_df.height} picks")
+
+    for name, df in cases:
+        index = DenseIndex(df, "player_id")
+
+        def join() -> pl.DataFrame:
+            return picks_df.join(df, on="player_id")
+
+        def take() -> pl.DataFrame:
+            return index.take(picks_df)
+
+        # every pick is in the table, so the inner join keeps every row and take has no nulls
+        assert take().sort("entry_id", "position").equals(join().sort("entry_id", "position"))
+
+        runs = 200
+        build_secs = timeit.timeit(lambda: DenseIndex(df, "player_id"), number=runs) / runs
+
+        print(f"{name}, index built in {build_secs * 1e3:.2f} ms")
+
+        for lookup in (join, take):
+            secs = timeit.timeit(lookup, number=runs) / runs
+
+            print(f"{lookup.__name__:>8} {secs * 1e3:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
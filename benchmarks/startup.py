@@ -0,0 +1,119 @@
+"""
+Times getting the team, player and gameweek data a worker starts from, loading the memory mapped files saved by
+the leader against decoding a bootstrap response and building the frames from it
+
+    python benchmarks/startup.py
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+import msgspec
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("FPL_STORE_PATH", ":memory:")
+
+from fpl.data.cache import (ReferenceData, ReferenceService, _gameweeks_frame,
+                            _players_frame, _teams_frame)
+from fpl.data.schemas import Bootstrap
+
+POSITIONS = ("Goalkeeper", "Defender", "Midfielder", "Forward")
+
+# fields in the response which the app doesn't read
+UNUSED_PLAYER_FIELDS = {
+    "chance_of_playing_next_round": None,
+    "cost_change_start": 0,
+    "form": "0.0",
+    "news": "",
+    "now_cost": 45,
+    "points_per_game": "0.0",
+    "selected_by_percent": "0.0",
+    "status": "a",
+    "total_points": 0,
+}
+
+
+def bootstrap_response(players: int = 700, seed: int = 0) -> bytes:
+    """
+    Returns a bootstrap response for a season of teams, players and gameweeks, like the api's
+    """
+
+    rng = random.Random(seed)
+    first_deadline = datetime(2024, 8, 16, 17, 30)
+
+    return json.dumps({
+        "teams": [{"id": team_id, "name": f"Team {team_id}", "short_name": f"T{team_id}"} for team_id in range(1, 21)],
+        "elements": [
+            {
+                "id": player_id,
+                "web_name": f"Player {player_id}",
+                "team": rng.randrange(1, 21),
+                "element_type": rng.randrange(1, 5),
+                "photo": f"{rng.randrange(10 ** 5, 10 ** 6)}.jpg",
+            } | UNUSED_PLAYER_FIELDS
+            for player_id in range(1, players + 1)
+        ],
+        "element_types": [
+            {"id": position_id, "singular_name": name} for position_id, name in enumerate(POSITIONS, start=1)
+        ],
+        "events": [
+            {
+                "id": gameweek_id,
+                "deadline_time": (first_deadline + timedelta(weeks=gameweek_id - 1)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "finished": False,
+                "data_checked": False,
+            }
+            for gameweek_id in range(1, 39)
+        ],
+    }).encode()
+
+
+def build(content: bytes) -> ReferenceData:
+    bootstrap_data = msgspec.json.decode(content, type=Bootstrap)
+
+    teams_df = _teams_frame(bootstrap_data.teams)
+
+    return ReferenceData(
+        version=1,
+        gameweeks=_gameweeks_frame(bootstrap_data.events),
+        players=_players_frame(bootstrap_data.elements, bootstrap_data.element_types, teams_df),
+        teams=teams_df,
+        updated=datetime.now()
+    )
+
+
+def load(path: str) -> ReferenceData:
+    # a new service for each run, as a worker starting up would
+    reference_data = ReferenceService(path)
+    assert reference_data.load()
+
+    return reference_data.snapshot()
+
+
+def main():
+    content = bootstrap_response()
+    built = build(content)
+
+    with tempfile.TemporaryDirectory() as path:
+        ReferenceService(path)._save(built)
+        loaded = load(path)
+
+        for table in ReferenceService.tables:
+            assert getattr(loaded, table).equals(getattr(built, table))
+
+        print(f"bootstrap response of {len(content) / 1024:.0f} KiB")
+
+        for name, get in (("decode", lambda: build(content)), ("load", lambda: load(path))):
+            runs = 50
+            secs = timeit.timeit(get, number=runs) / runs
+
+            print(f"{name:>8} {secs * 1e3:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,13 +9,17 @@ class League:
     name: str
 
 
+# leagues that can be selected, which are also prefetched after each gameweek deadline
+LEAGUES = [
+    League(id="737576", name="The Ladzio Memorial Cup"),
+]
+
+
 class LeagueSelectState(rx.State):
 
-    leagues: list[League] = [
-        League(id="737576", name="The Ladzio Memorial Cup"),
-    ]
+    leagues: list[League] = LEAGUES
 
-    selected_league: League | None = leagues[0]
+    selected_league: League | None = LEAGUES[0]
 
     def set_selected_league(self, league_id: str):
         self.selected_league = next((l for l in self.leagues if l.id == league_id), None)
@@ -1,46 +1,215 @@
-from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
 from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable
 
 import httpx
+import msgspec
 import polars as pl
-import pytz
 
 from ..exceptions.fpl_api_exception import FplApiException
+from ..settings import settings
+from .clock import gameweek_clock
 from .config import *
+from .hedging import HedgeBudget, LatencyTracker, endpoint, hedged
+from .history import history_store
+from .limiter import AdaptiveLimiter
+from .response_cache import ResponseCache
+from .revalidation import Revalidator
+from .schemas import (EntryGameweek, LeagueStandings, Live, Pick, Standing,
+                      Transfer, live_to_frame, to_frame)
+from .singleflight import SingleFlight
+from .store import entry_store
 
 
-def api_client() -> httpx.Client:
+CLIENT: httpx.AsyncClient | None = None
+
+limiter = AdaptiveLimiter(
+    settings.api_concurrency_initial,
+    settings.api_concurrency_min,
+    settings.api_concurrency_max,
+    settings.api_latency_target_secs
+)
+
+hedge_budget = HedgeBudget(settings.api_hedge_budget_ratio, settings.api_hedge_burst)
+
+latencies = LatencyTracker(
+    settings.api_hedge_sample_size,
+    settings.api_hedge_min_samples,
+    settings.api_hedge_percentile
+)
+
+response_cache = ResponseCache()
+
+# drop cached responses that depend on the gameweek when it rolls over
+gameweek_clock.subscribe(response_cache.observe_gameweek)
+
+revalidator = Revalidator(settings.cache_max_entries)
+
+single_flight = SingleFlight()
+
+
+async def _raise_for_status(response: httpx.Response):
+    """
+    Raises an exception for error responses from the FPL API
+    """
+
+    # not modified responses are answered from the revalidator
+    if response.status_code != 304:
+        response.raise_for_status()
+
+
+def _create_client() -> httpx.AsyncClient:
     """
-    Returns a client for connecting to the FPL API
+    Returns a new pooled client for connecting to the FPL API
     """
 
-    return httpx.Client(
-        base_url="https://fantasy.premierleague.com/api",
-        event_hooks={"response": [lambda x: x.raise_for_status()]}
+    limits = httpx.Limits(
+        max_connections=settings.api_max_connections,
+        max_keepalive_connections=settings.api_max_keepalive_connections,
+        keepalive_expiry=settings.api_keepalive_expiry_secs
+    )
+
+    return httpx.AsyncClient(
+        base_url=settings.api_base_url,
+        event_hooks={"response": [_raise_for_status]},
+        http2=settings.api_http2,
+        limits=limits,
+        timeout=settings.api_timeout_secs
     )
 
 
+def api_client() -> httpx.AsyncClient:
+    """
+    Returns the shared client for connecting to the FPL API
+    """
+
+    global CLIENT
+
+    if CLIENT is None:
+        CLIENT = _create_client()
+
+    return CLIENT
+
+
+async def close_api_client():
+    """
+    Closes the shared client and its pooled connections
+    """
+
+    global CLIENT
+
+    if CLIENT is not None:
+        await CLIENT.aclose()
+        CLIENT = None
+
+
+async def open_api_client():
+    """
+    Opens the shared client and warms its connections to the FPL API
+    """
+
+    client = api_client()
+
+    # a single http/2 connection multiplexes every request so only needs one warm connection
+    warm_connections = 1 if settings.api_http2 else settings.api_warm_connections
+
+    try:
+        await asyncio.gather(*(client.get("event-status/") for _ in range(warm_connections)))
+    except httpx.HTTPError:
+        # connections will be opened on first use instead
+        pass
+
+
+async def _request(client: httpx.AsyncClient, url: str, params: dict[str, any] | None = None, headers: dict[str, str] | None = None) -> httpx.Response:
+    """
+    Returns the response for the url, waiting for the shared limit on concurrent requests and hedging
+    requests which are slow for their endpoint
+    """
+
+    url_endpoint = endpoint(url)
+
+    async def attempt() -> httpx.Response:
+        async with limiter:
+            started = time.monotonic()
+
+            try:
+                response = await client.get(url, params=params, headers=headers)
+            except httpx.HTTPStatusError as exc:
+                limiter.record(exc.response.status_code, time.monotonic() - started)
+                raise
+            except httpx.TransportError:
+                limiter.record(None, time.monotonic() - started)
+                raise
+
+            latency_secs = time.monotonic() - started
+            limiter.record(response.status_code, latency_secs)
+            latencies.record(url_endpoint, latency_secs)
+
+            return response
+
+    # hedging while requests are queued for the limiter would only add to the queue
+    if not settings.api_hedge_requests or limiter.waiting:
+        return await attempt()
+
+    return await hedged(attempt, latencies.threshold(url_endpoint), hedge_budget)
+
+
+async def gather_entries(fetch: Callable[[int], Awaitable], entry_ids: list[int]) -> list:
+    """
+    Returns the results of fetching each entry concurrently, bounded by the shared request limit
+    """
+
+    return await asyncio.gather(*(fetch(entry_id) for entry_id in entry_ids))
+
+
+async def get_parsed(client: httpx.AsyncClient, url: str, schema: type, parse: Callable[[any], any], params: dict[str, any] | None = None) -> any:
+    """
+    Returns the json response for the url decoded to the schema and parsed, from the cache, otherwise sharing
+    one conditional request between concurrent callers
+    """
+
+    # the same url can be parsed differently by each fetcher so the parser is part of the key
+    key = (url, tuple(sorted((params or {}).items())), parse.__qualname__)
+
+    if (parsed := response_cache.get(key)) is not None:
+        return parsed
+
+    async def fetch():
+        response = await _request(client, url, params, revalidator.headers(key))
+
+        # remembered result was evicted while the request was in flight
+        if response.status_code == 304 and not revalidator.is_unchanged(key, response):
+            response = await _request(client, url, params)
+
+        parsed = revalidator.parse(key, response, lambda content: parse(msgspec.json.decode(content, type=schema)))
+        response_cache.put(key, url, parsed)
+        return parsed
+
+    return await single_flight.do(key, fetch)
+
+
 def current_gameweek_id() -> int:
     """
     Returns the current gameweek id
     """
 
-    from .cache import GAMEWEEKS_DF
+    return gameweek_clock.current()
 
-    return (
-        GAMEWEEKS_DF.filter(pl.col("deadline_time") <= datetime.now(pytz.UTC))
-        .sort("deadline_time", descending=True)
-        .row(0)[0]
-    )
+
+def finalised_gameweek_id() -> int:
+    """
+    Returns the id of the latest gameweek whose points have been finalised or zero if none have
+    """
+
+    return gameweek_clock.finalised()
 
 
-def get_entry_points_history(client: httpx.Client, entry_id: int, gameweek_id: int | None = None) -> pl.DataFrame:
+async def get_entry_points_history(client: httpx.AsyncClient, entry_id: int, gameweek_id: int | None = None) -> pl.DataFrame:
     """
     Returns the points by week for the entry
     """
 
-    col_map = {"event": "gameweek_id"}
-
     return_fields = (
         "gameweek_id",
         "entry_id",
@@ -48,17 +217,13 @@ def get_entry_points_history(client: httpx.Client, entry_id: int, gameweek_id: i
     )
 
     try:
+        # the whole season includes the gameweek being played
+        gameweeks_df, _ = await history_store.get(client, entry_id, live=not gameweek_id)
+
         if gameweek_id:
-            api_data = client.get(f"entry/{entry_id}/event/{gameweek_id}/picks/").json()["entry_history"]
-        else:
-            api_data = client.get(f"entry/{entry_id}/history/").json()["current"]
-        return (
-            pl.DataFrame(api_data)
-            .with_columns(entry_id=entry_id)
-            .with_columns(pl.col("event").cast(pl.Int32))
-            .rename(col_map)
-            .select(return_fields)
-        )
+            return gameweeks_df.filter(pl.col("gameweek_id") == gameweek_id).select(return_fields)
+
+        return gameweeks_df.select(return_fields)
 
     except httpx.HTTPStatusError as exc:
         if exc.response.status_code == 404:
@@ -68,38 +233,15 @@ def get_entry_points_history(client: httpx.Client, entry_id: int, gameweek_id: i
         raise Exception(f"Error getting points history for entry {entry_id}")
 
 
-def get_entry_extras(client: httpx.Client, entry_id: int, gameweek_id: int) -> tuple[str | None, str]:
+def entry_extras(entry_gameweek: EntryGameweek) -> tuple[str | None, str]:
     """
-    Returns the gameweek chips and transfer cost for an entry
+    Returns the gameweek chip and transfer cost for an entry
     """
 
-    chip = None
-    transfer_costs = 0
-
-    try:
-        api_data = client.get(f"entry/{entry_id}/history/").json()
-
-        chips_df = pl.DataFrame(api_data["chips"])
-        gameweek_chip = chips_df.filter(pl.col("event") == gameweek_id)
-
-        if not gameweek_chip.is_empty():
-            chip = gameweek_chip.row(0, named=True)["name"]
-
-        current_df = pl.DataFrame(api_data["current"])
-        current_df = current_df.filter(pl.col("event") == gameweek_id)
-
-        transfer_costs = current_df.row(0, named=True)["event_transfers_cost"]
-
-        return (chip, str(transfer_costs))
-    except httpx.HTTPStatusError as exc:
-        if exc.response.status_code == 404:
-            raise FplApiException(f"No selected players found for entry {entry_id}")
-        raise FplApiException(f"Error getting selected players for entry {entry_id} from Fantasy Premier League")
-    except Exception:
-        raise Exception(f"Error getting selected players for entry {entry_id}")
+    return (entry_gameweek.active_chip, str(entry_gameweek.entry_history.event_transfers_cost))
 
 
-def get_entry_picks(client: httpx.Client, entry_id: int, gameweek_id: int) -> pl.DataFrame:
+def entry_picks(entry_id: int, entry_gameweek: EntryGameweek) -> pl.DataFrame:
     """
     Returns the gameweek picks for an entry
     """
@@ -116,15 +258,30 @@ def get_entry_picks(client: httpx.Client, entry_id: int, gameweek_id: int) -> pl
         "is_captain"
     )
 
+    return (
+        to_frame(entry_gameweek.picks, Pick)
+        .with_columns(entry_id=entry_id)
+        .rename(col_map)
+        .select(return_cols)
+    )
+
+
+async def get_entry_gameweek(client: httpx.AsyncClient, entry_id: int, gameweek_id: int) -> EntryGameweek:
+    """
+    Returns the picks, transfer cost and chip for an entry in the gameweek from a single request
+    """
+
     try:
-        api_data = client.get(f"entry/{entry_id}/event/{gameweek_id}/picks/").json()["picks"]
+        # picks are only published once the deadline has passed so the picks, chip and transfer cost never change
+        # after they are first fetched
+        entry_gameweek = await entry_store.get("gameweeks", entry_id, gameweek_id)
 
-        return (
-            pl.DataFrame(api_data)
-            .with_columns(entry_id=entry_id)
-            .rename(col_map)
-            .select(return_cols)
-        )
+        if entry_gameweek is None:
+            entry_gameweek = await get_parsed(
+                client, f"entry/{entry_id}/event/{gameweek_id}/picks/", EntryGameweek, lambda entry_gameweek: entry_gameweek)
+            entry_store.put("gameweeks", entry_id, gameweek_id, entry_gameweek)
+
+        return entry_gameweek
     except httpx.HTTPStatusError as exc:
         if exc.response.status_code == 404:
             raise FplApiException(f"No selected players found for entry {entry_id}")
@@ -133,19 +290,20 @@ def get_entry_picks(client: httpx.Client, entry_id: int, gameweek_id: int) -> pl
         raise Exception(f"Error getting selected players for entry {entry_id}")
 
 
-def get_fixtures(client: httpx.Client, gameweek_id: int) -> pl.DataFrame:
+async def get_entry_picks(client: httpx.AsyncClient, entry_id: int, gameweek_id: int) -> pl.DataFrame:
     """
-    Returns the fixtures and scores for the gameweek
+    Returns the gameweek picks for an entry
     """
 
-    from .cache import TEAMS_DF
+    return entry_picks(entry_id, await get_entry_gameweek(client, entry_id, gameweek_id))
 
-    col_map = {
-        "team_h": "home_team_id",
-        "team_h_score": "home_team_score",
-        "team_a": "away_team_id",
-        "team_a_score": "away_team_score",
-    }
+
+async def get_fixtures(client: httpx.AsyncClient, gameweek_id: int) -> pl.DataFrame:
+    """
+    Returns the fixtures and scores for the gameweek
+    """
+
+    from .fixtures import fixture_store
 
     return_fields = (
         "id",
@@ -161,9 +319,6 @@ def get_fixtures(client: httpx.Client, gameweek_id: int) -> pl.DataFrame:
         "away_team_logo"
     )
 
-    # convert to date for sorting
-    kickoff_time = pl.col("kickoff_time").str.strptime(pl.Datetime, "%Y-%m-%dT%H:%M:%SZ").alias("kickoff_time")
-
     # status column will contain elapsed time of scheduled kick-off e.g. 59' / FT / Sat 12 Sep 15:00
     status = (
         pl.when(pl.col("finished_provisional") == True)
@@ -180,21 +335,15 @@ def get_fixtures(client: httpx.Client, gameweek_id: int) -> pl.DataFrame:
     )
 
     try:
-        api_data = client.get("fixtures/").json()
+        await fixture_store.refresh(client, gameweek_id)
 
-        df = pl.DataFrame(api_data).filter(pl.col("event") == gameweek_id)
+        df = fixture_store.gameweek(gameweek_id)
 
         if df.is_empty():
             return pl.DataFrame()
 
         return (
-            df.with_columns(kickoff_time)
-            .with_columns(status)
-            .rename(col_map)
-            .join(TEAMS_DF, left_on="away_team_id", right_on="team_id")
-            .rename({"team_name": "away_team_name", "logo": "away_team_logo"})
-            .join(TEAMS_DF, left_on="home_team_id", right_on="team_id")
-            .rename({"team_name": "home_team_name", "logo": "home_team_logo"})
+            df.with_columns(status)
             .sort(pl.col("kickoff_time"))
             .select(return_fields)
         )
@@ -206,12 +355,14 @@ def get_fixtures(client: httpx.Client, gameweek_id: int) -> pl.DataFrame:
         raise Exception(f"Error getting fixtures for gameweek {gameweek_id}")
 
 
-def get_league_picks(client: httpx.Client, gameweek_id: int, league_df: pl.DataFrame) -> pl.DataFrame:
+async def get_league_picks(client: httpx.AsyncClient, gameweek_id: int, league_df: pl.DataFrame) -> pl.DataFrame:
     """
     Returns the gameweek picks for all teams in the league
     """
 
-    from .cache import PLAYERS_DF
+    from .cache import reference_data
+
+    player_index = reference_data.snapshot().player_index
 
     return_fields = (
         "entry_id",
@@ -227,14 +378,12 @@ def get_league_picks(client: httpx.Client, gameweek_id: int, league_df: pl.DataF
     )
 
     try:
-        # get picks for each entry in parallel
-        with ThreadPoolExecutor() as executor:
-            picks = list(executor.map(lambda entry_id: get_entry_picks(
-                client, entry_id, gameweek_id), league_df["entry_id"].to_list()))
+        # get picks for each entry concurrently
+        picks = await gather_entries(
+            lambda entry_id: get_entry_picks(client, entry_id, gameweek_id), league_df["entry_id"].to_list())
 
         return (
-            pl.concat(picks)
-            .join(PLAYERS_DF, on="player_id")
+            player_index.take(pl.concat(picks))
             .join(league_df, on="entry_id")
             .filter(pl.col("position") < 12)
             .select(return_fields)
@@ -243,41 +392,15 @@ def get_league_picks(client: httpx.Client, gameweek_id: int, league_df: pl.DataF
         raise Exception(f"Error getting selected players in league for gameweek {gameweek_id}")
 
 
-def get_league_table(client: httpx.Client, league_id: int) -> pl.DataFrame:
+async def get_league_table(client: httpx.AsyncClient, league_id: int) -> pl.DataFrame:
     """
     Returns the current league table
     """
 
-    col_map = {
-        "entry": "entry_id",
-        "player_name": "manager_name",
-    }
-
-    return_fields = (
-        "entry_id",
-        "manager_name",
-        "entry_name",
-        "total"
-    )
-
-    try:
-        api_data = client.get(f"leagues-classic/{league_id}/standings/").json()["standings"]["results"]
-
-        return (
-            pl.DataFrame(api_data)
-            .rename(col_map)
-            .with_columns(pl.col("entry_id").cast(pl.Int32))
-            .select(return_fields)
-        )
-    except httpx.HTTPStatusError as exc:
-        if exc.response.status_code == 404:
-            raise FplApiException(f"No league found with id {league_id}")
-        raise FplApiException(f"Error getting table for league {league_id} from Fantasy Premier League")
-    except Exception:
-        raise Exception(f"Error getting table for league {league_id}")
+    return pl.concat([league_df async for league_df in iter_league_table(client, league_id)])
 
 
-def get_player_points(client: httpx.Client, gameweek_id: int) -> pl.DataFrame:
+async def get_player_points(client: httpx.AsyncClient, gameweek_id: int) -> pl.DataFrame:
     """
     Returns the points scored by each player in a gameweek
     """
@@ -303,14 +426,15 @@ def get_player_points(client: httpx.Client, gameweek_id: int) -> pl.DataFrame:
         "stats.yellow_cards",
     )
 
-    try:
-        api_data = client.get(f"event/{gameweek_id}/live/").json()["elements"]
-
+    def parse(live: Live) -> pl.DataFrame:
         return (
-            pl.json_normalize(api_data)
+            live_to_frame(live)
             .select(return_fields)
             .rename(col_map)
         )
+
+    try:
+        return await get_parsed(client, f"event/{gameweek_id}/live/", Live, parse)
     except httpx.HTTPStatusError as exc:
         if exc.response.status_code == 404:
             raise FplApiException(f"No live points found for gameweek {gameweek_id}")
@@ -319,11 +443,13 @@ def get_player_points(client: httpx.Client, gameweek_id: int) -> pl.DataFrame:
         raise Exception(f"Error getting live points for gameweek {gameweek_id}")
 
 
-def get_transfers(client: httpx.Client, entry_id: int, gameweek_id: int, league_df: pl.DataFrame) -> pl.DataFrame | None:
+async def get_transfers(client: httpx.AsyncClient, entry_id: int, gameweek_id: int, league_df: pl.DataFrame) -> pl.DataFrame | None:
     """
     Returns the tranfers made by each entry in the current gameweek
     """
-    from .cache import PLAYERS_DF
+    from .cache import reference_data
+
+    player_index = reference_data.snapshot().player_index
 
     return_fields = (
         "entry_id",
@@ -334,24 +460,40 @@ def get_transfers(client: httpx.Client, entry_id: int, gameweek_id: int, league_
         "img_url_out",
     )
 
+    def parse(transfers: list[Transfer]) -> dict[int, list[Transfer]]:
+        gameweek_transfers = {}
+
+        for transfer in transfers:
+            gameweek_transfers.setdefault(transfer.event, []).append(transfer)
+
+        return gameweek_transfers
+
     try:
-        api_data = client.get(f"entry/{entry_id}/transfers/").json()
+        transfers = await entry_store.get("transfers", entry_id, gameweek_id)
+
+        if transfers is None:
+            gameweek_transfers = await get_parsed(client, f"entry/{entry_id}/transfers/", list[Transfer], parse)
+
+            transfers = gameweek_transfers.get(gameweek_id, [])
 
-        if not api_data:
+            # transfers for a gameweek can't change once its deadline has passed
+            if gameweek_id <= current_gameweek_id():
+                entry_store.put("transfers", entry_id, gameweek_id, transfers)
+
+        if not transfers:
             return None
 
-        return (
-            pl.DataFrame(api_data)
-            .filter(pl.col("event") == gameweek_id)
+        df = (
+            to_frame(transfers, Transfer)
             .rename({"entry": "entry_id"})
             .with_columns(pl.col("entry_id").cast(pl.Int32))
             .join(league_df, on="entry_id")
-            .join(PLAYERS_DF, left_on="element_in", right_on="player_id")
-            .rename({"web_name": "web_name_in", "img_url": "img_url_in"})
-            .join(PLAYERS_DF, left_on="element_out", right_on="player_id", suffix="_out")
-            .rename({"web_name": "web_name_out", "img_url": "img_url_out"})
-            .select(return_fields)
         )
+
+        df = player_index.take(df, on="element_in", suffix="_in")
+        df = player_index.take(df, on="element_out", suffix="_out")
+
+        return df.select(return_fields)
     except httpx.HTTPStatusError as exc:
         if exc.response.status_code == 404:
             raise FplApiException(f"No transfers found for gameweek {gameweek_id}")
@@ -360,6 +502,64 @@ def get_transfers(client: httpx.Client, entry_id: int, gameweek_id: int, league_
         raise Exception(f"Error getting transfers for gameweek {gameweek_id}")
 
 
+async def iter_league_table(client: httpx.AsyncClient, league_id: int) -> AsyncIterator[pl.DataFrame]:
+    """
+    Yields the current league table a page of entries at a time as the pages arrive
+    """
+
+    col_map = {
+        "entry": "entry_id",
+        "player_name": "manager_name",
+    }
+
+    return_fields = (
+        "entry_id",
+        "manager_name",
+        "entry_name",
+        "total"
+    )
+
+    def parse(league: LeagueStandings) -> tuple[pl.DataFrame, bool]:
+        return (
+            to_frame(league.standings.results, Standing)
+            .rename(col_map)
+            .with_columns(pl.col("entry_id").cast(pl.Int32))
+            .select(return_fields),
+            league.standings.has_next
+        )
+
+    async def get_page(page: int) -> tuple[int, pl.DataFrame, bool]:
+        return (page, *await get_parsed(client, f"leagues-classic/{league_id}/standings/", LeagueStandings, parse,
+                                        params={"page_standings": page}))
+
+    try:
+        _, league_df, has_next = await get_page(1)
+        yield league_df
+
+        last_page = 1
+
+        # total number of pages isn't known so request a window of pages at a time until the last page is found
+        while has_next:
+            pages = range(last_page + 1, last_page + 1 + settings.api_standings_page_window)
+
+            for next_page in asyncio.as_completed([get_page(page) for page in pages]):
+                page, league_df, page_has_next = await next_page
+
+                if not league_df.is_empty():
+                    yield league_df
+
+                if page == pages[-1]:
+                    has_next = page_has_next
+
+            last_page = pages[-1]
+    except httpx.HTTPStatusError as exc:
+        if exc.response.status_code == 404:
+            raise FplApiException(f"No league found with id {league_id}")
+        raise FplApiException(f"Error getting table for league {league_id} from Fantasy Premier League")
+    except Exception:
+        raise Exception(f"Error getting table for league {league_id}")
+
+
 def latest_player_activity(cache: pl.DataFrame, unique_player_points: pl.DataFrame, event_id: int) -> pl.DataFrame | None:
     """
     Returns the latest events and associated managers for players whose points have changed since the last refresh
@@ -396,33 +596,48 @@ def latest_player_activity(cache: pl.DataFrame, unique_player_points: pl.DataFra
             .filter(pl.col("stats.total_points") != pl.col("stats.total_points_cache"))
         )
 
-        activity_dfs: list[pl.DataFrame] = []
-
-        for config in SCORING_CONFIG:
-            # get rows for scoring event
-            df = points_diff.filter(config["filter"])
-            if not df.is_empty():
-                # add event description as new column
-                df = df.with_columns(event=pl.lit(config["event"]))
-                # add event badge colour as new column
-                df = df.with_columns(badge_colour=pl.lit(config["badge_colour"]))
-                # add absolute points if value is integer
-                if isinstance(config["points"], int):
-                    df = df.with_columns(points=pl.lit(config["points"]))
-                # otherwise points come from expression
-                else:
-                    df = df.with_columns(config["points"])
-
-                # points can be positive or negative and if not always the same type, concat will fail
-                # so ensure always Int64
-                df = df.with_columns(pl.col("points").cast(pl.Int64))
-
-                activity_dfs.append(df)
-
-        if not activity_dfs:
+        # evaluate every scoring rule against every changed player in one pass, then turn the counts into one row
+        # per event ordered by rule and player
+        events_df = (
+            points_diff
+            .with_row_index("row")
+            .select(
+                "row",
+                *(
+                    pl.struct(
+                        events=config["events"].cast(pl.Int64),
+                        # points are either an integer or an expression and not always the same type, so ensure
+                        # always Int64
+                        points=(
+                            pl.lit(config["points"]) if isinstance(config["points"], int) else config["points"]
+                        ).cast(pl.Int64)
+                    ).alias(str(rule))
+                    for rule, config in enumerate(SCORING_CONFIG)
+                )
+            )
+            .unpivot(index="row", variable_name="rule")
+            .unnest("value")
+            .filter(pl.col("events") > 0)
+            .with_columns(pl.col("rule").cast(pl.Int64))
+            .sort("rule", "row")
+            .select("row", "rule", "points", pl.int_ranges(0, "events").alias("events"))
+            .explode("events")
+        )
+
+        if events_df.is_empty():
             return None
 
-        activity_df = pl.concat(activity_dfs)
+        activity_df = (
+            points_diff[events_df["row"]]
+            .with_columns(
+                event=events_df["rule"].replace_strict(
+                    {rule: config["event"] for rule, config in enumerate(SCORING_CONFIG)}),
+                badge_colour=events_df["rule"].replace_strict(
+                    {rule: config["badge_colour"] for rule, config in enumerate(SCORING_CONFIG)}),
+                points=events_df["points"]
+            )
+        )
+
         # add current timestamp as event time
         activity_df = activity_df.with_columns(time=pl.lit(event_time.strftime("%H:%M")))
         # add incrementing integers as id
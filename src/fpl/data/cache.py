@@ -1,43 +1,67 @@
-import json
+import asyncio
+import dataclasses
+import fcntl
+import functools
+import os
+import shutil
+import time
+from datetime import datetime
 
 import polars as pl
+import pyarrow as pa
+import pyarrow.ipc
 
-GAMEWEEKS_DF = None
-PLAYERS_DF = None
-TEAMS_DF = None
+from ..settings import settings
+from .lookup import DenseIndex
+from .schemas import Bootstrap, Gameweek, Player, Position, Team, to_frame
 
 
-def _cache_gameweeks(gameweeks_data: dict[str, any]):
+@dataclasses.dataclass(frozen=True)
+class ReferenceData:
+    version: int
+    gameweeks: pl.DataFrame
+    players: pl.DataFrame
+    teams: pl.DataFrame
+    updated: datetime
+
+    @functools.cached_property
+    def player_index(self) -> DenseIndex:
+        return DenseIndex(self.players, "player_id")
+
+    @functools.cached_property
+    def team_index(self) -> DenseIndex:
+        return DenseIndex(self.teams, "team_id")
+
+
+def _gameweeks_frame(gameweeks_data: list[Gameweek]) -> pl.DataFrame:
     """
-    Cache static gameweek data
+    Returns static gameweek data
     """
 
-    global GAMEWEEKS_DF
-
     col_map = {
         "id": "gameweek_id"
     }
 
     return_fields = (
         "gameweek_id",
-        "deadline_time"
+        "deadline_time",
+        "finished",
+        "data_checked"
     )
 
-    GAMEWEEKS_DF = (
-        pl.DataFrame(gameweeks_data)
+    return (
+        to_frame(gameweeks_data, Gameweek)
         .rename(col_map)
         .with_columns(pl.col("deadline_time").str.strptime(pl.Datetime, format="%+"))
         .select(return_fields)
     )
 
 
-def _cache_players(players_data: dict[str, any], positions_data: dict[str, any]):
+def _players_frame(players_data: list[Player], positions_data: list[Position], teams_df: pl.DataFrame) -> pl.DataFrame:
     """
-    Cache static player data
+    Returns static player data
     """
 
-    global PLAYERS_DF
-
     players_col_map = {
         "id": "player_id",
         "team": "team_id",
@@ -72,31 +96,29 @@ def _cache_players(players_data: dict[str, any], positions_data: dict[str, any])
     )
 
     players_df = (
-        pl.json_normalize(players_data)
+        to_frame(players_data, Player)
         .rename(players_col_map)
         .with_columns(img_to_png)
         .with_columns(img_url)
     )
 
     positions_df = (
-        pl.json_normalize(positions_data)
+        to_frame(positions_data, Position)
         .rename(positions_col_map)
     )
 
-    PLAYERS_DF = (
-        players_df.join(TEAMS_DF, on="team_id", how="left")
+    return (
+        players_df.join(teams_df, on="team_id", how="left")
         .join(positions_df, on="position_id")
         .select(return_fields)
     )
 
 
-def _cache_teams(teams_data: dict[str, any]):
+def _teams_frame(teams_data: list[Team]) -> pl.DataFrame:
     """
-    Cache static team data
+    Returns static team data
     """
 
-    global TEAMS_DF
-
     col_map = {
         "id": "team_id",
         "name": "team_name"
@@ -119,24 +141,233 @@ def _cache_teams(teams_data: dict[str, any]):
         .alias("logo")
     )
 
-    TEAMS_DF = (
-        pl.json_normalize(teams_data)
+    return (
+        to_frame(teams_data, Team)
         .rename(col_map)
         .with_columns(logo)
         .select(return_fields)
     )
 
 
-def cache_data():
+class ReferenceService():
     """
-    Returns static team and player metadata
+    Holds the static team, player and gameweek data as an immutable snapshot, refreshing it in the background
+    and swapping in a new version whenever it changes
+
+    Each version is saved as a generation of memory mapped files shared by every worker, with only the worker
+    holding the leader lock fetching from the api and the others loading each new generation it saves
     """
 
-    from .api import api_client
+    tables = (
+        "gameweeks",
+        "players",
+        "teams"
+    )
+
+    def __init__(self, path: str):
+        self._path = path
+        self._snapshot: ReferenceData | None = None
+        self._task: asyncio.Task | None = None
+        self._leader_lock: int | None = None
+        self._loaded_generation: int | None = None
+        # snapshot loaded from disk may be out of date until it has been revalidated against the api
+        self._revalidated = False
+
+    def snapshot(self) -> ReferenceData:
+        """
+        Returns the latest snapshot, which callers should keep hold of for a consistent view across awaits
+        """
+
+        return self._snapshot
+
+    def load(self) -> bool:
+        """
+        Publishes the latest generation saved to disk if newer than the current snapshot, returning whether there
+        is a saved generation
+        """
+
+        generation = self._generation()
+
+        if generation is None:
+            return False
+
+        if generation == self._loaded_generation:
+            return True
+
+        try:
+            tables = {table: self._read(generation, table) for table in self.tables}
+        except (OSError, ValueError, pl.exceptions.PolarsError):
+            return False
+
+        self._snapshot = ReferenceData(
+            version=generation,
+            updated=datetime.fromtimestamp(os.path.getmtime(self._generation_file())),
+            **tables
+        )
+        self._loaded_generation = generation
+
+        return True
+
+    async def refresh(self):
+        """
+        Fetches the static data and publishes a new snapshot if it has changed
+        """
+
+        from .api import api_client, get_parsed
+
+        bootstrap_data = await get_parsed(api_client(), "bootstrap-static/", Bootstrap, lambda bootstrap: bootstrap)
+        self._revalidated = True
+
+        teams_df = _teams_frame(bootstrap_data.teams)
+        players_df = _players_frame(bootstrap_data.elements, bootstrap_data.element_types, teams_df)
+        gameweeks_df = _gameweeks_frame(bootstrap_data.events)
+
+        previous = self._snapshot
+
+        if (
+            previous
+            and previous.teams.equals(teams_df)
+            and previous.players.equals(players_df)
+            and previous.gameweeks.equals(gameweeks_df)
+        ):
+            return
+
+        snapshot = ReferenceData(
+            version=max(previous.version if previous else 0, self._generation() or 0) + 1,
+            gameweeks=gameweeks_df,
+            players=players_df,
+            teams=teams_df,
+            updated=datetime.now()
+        )
+
+        if self.lead():
+            try:
+                await asyncio.to_thread(self._save, snapshot)
+            except OSError:
+                pass
+            else:
+                # serve the memory mapped files shared with the other workers rather than a private copy
+                if self.load():
+                    return
+
+        # readers holding the previous snapshot keep using it, new readers get the new one
+        self._snapshot = snapshot
+
+    def _generation(self) -> int | None:
+        """
+        Returns the latest generation saved to disk or none if nothing has been saved
+        """
+
+        try:
+            with open(self._generation_file()) as file:
+                return int(file.read())
+        except (OSError, ValueError):
+            return None
+
+    def _generation_file(self) -> str:
+        """
+        Returns the path of the file holding the latest generation
+        """
+
+        return os.path.join(self._path, "generation")
+
+    def _file(self, generation: int, table: str) -> str:
+        """
+        Returns the path of the file the table is saved to for the generation
+        """
+
+        return os.path.join(self._path, str(generation), f"{table}.arrow")
+
+    def lead(self) -> bool:
+        """
+        Returns whether this worker holds the lock for refreshing from the api, taking it if free
+        """
+
+        if self._leader_lock is None:
+            os.makedirs(self._path, exist_ok=True)
+            lock = os.open(os.path.join(self._path, "leader.lock"), os.O_RDWR | os.O_CREAT)
+
+            try:
+                # released by the os if the worker exits so another worker can take over
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(lock)
+                return False
+
+            self._leader_lock = lock
+
+        return True
+
+    def _read(self, generation: int, table: str) -> pl.DataFrame:
+        """
+        Returns the table saved for the generation, memory mapped so every worker shares one copy
+        """
+
+        # polars copies ipc files it reads into memory, whereas arrow columns read from a memory map point into the
+        # file and polars takes them over as is. the frame keeps the mapping open, which stays valid after the file
+        # is deleted
+        with pa.memory_map(self._file(generation, table)) as source:
+            return pl.from_arrow(pa.ipc.open_file(source).read_all())
+
+    def _save(self, snapshot: ReferenceData):
+        """
+        Saves each table of the snapshot as a new generation, only publishing the generation once fully written
+        """
+
+        os.makedirs(os.path.dirname(self._file(snapshot.version, "")), exist_ok=True)
+
+        # uncompressed so the files can be mapped without copying
+        for table in self.tables:
+            getattr(snapshot, table).write_ipc(self._file(snapshot.version, table), compression="uncompressed")
+
+        with open(f"{self._generation_file()}.tmp", "w") as file:
+            file.write(str(snapshot.version))
+
+        os.replace(f"{self._generation_file()}.tmp", self._generation_file())
+
+        # workers still mapping an older generation keep their copy until they load the new one
+        for name in os.listdir(self._path):
+            if name.isdigit() and int(name) < snapshot.version - 1:
+                shutil.rmtree(os.path.join(self._path, name), ignore_errors=True)
+
+    def start(self):
+        """
+        Starts refreshing in the background
+        """
+
+        async def run():
+            refreshed = time.monotonic() if self._revalidated else 0
+
+            while True:
+                try:
+                    # revalidate a snapshot loaded from disk straight away
+                    if self.lead() and time.monotonic() - refreshed >= settings.reference_refresh_interval_secs:
+                        refreshed = time.monotonic()
+                        await self.refresh()
+                    else:
+                        self.load()
+                except Exception:
+                    # keep serving the current snapshot until the next successful refresh
+                    pass
+
+                await asyncio.sleep(settings.reference_check_interval_secs)
+
+        self._task = asyncio.create_task(run())
+
+    async def stop(self):
+        """
+        Stops refreshing
+        """
+
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        # let another worker take over refreshing
+        if self._leader_lock is not None:
+            os.close(self._leader_lock)
+            self._leader_lock = None
 
-    with api_client() as client:
-        bootstrap_data = client.get("bootstrap-static/").json()
 
-    _cache_teams(bootstrap_data["teams"])
-    _cache_players(bootstrap_data["elements"], bootstrap_data["element_types"])
-    _cache_gameweeks(bootstrap_data["events"])
+reference_data = ReferenceService(settings.reference_path)
@@ -0,0 +1,151 @@
+import asyncio
+import bisect
+import inspect
+from datetime import datetime
+from typing import Awaitable, Callable
+
+import pytz
+
+from ..settings import settings
+
+
+class GameweekClock():
+    """
+    Answers the current and next gameweek from the sorted gameweek deadlines, keeping the answer until the next
+    deadline passes and notifying subscribers when the gameweek rolls over
+    """
+
+    def __init__(self):
+        # reference data version the deadlines were taken from
+        self._version: int | None = None
+        self._deadlines: list[datetime] = []
+        self._gameweek_ids: list[int] = []
+        self._finalised_id = 0
+        self._index: int | None = None
+        self._until: datetime | None = None
+        self._subscribers: list[Callable[[int], Awaitable | None]] = []
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, callback: Callable[[int], Awaitable | None]):
+        """
+        Calls the callback with the gameweek id whenever the current gameweek is first known or rolls over
+        """
+
+        self._subscribers.append(callback)
+
+    def current(self) -> int:
+        """
+        Returns the id of the gameweek whose deadline passed most recently
+        """
+
+        self._tick()
+        return self._gameweek_ids[self._index]
+
+    def next(self) -> int | None:
+        """
+        Returns the id of the gameweek with the next deadline or none after the last deadline of the season
+        """
+
+        self._tick()
+
+        if self._index + 1 < len(self._gameweek_ids):
+            return self._gameweek_ids[self._index + 1]
+
+        return None
+
+    def next_deadline(self) -> datetime | None:
+        """
+        Returns the next deadline or none after the last deadline of the season
+        """
+
+        self._tick()
+        return self._until
+
+    def finalised(self) -> int:
+        """
+        Returns the id of the latest gameweek whose points have been finalised or zero if none have
+        """
+
+        self._tick()
+        return self._finalised_id
+
+    def _tick(self):
+        """
+        Rebuilds the deadlines when the reference data changes and moves to the gameweek for the current time
+        once the next deadline has passed
+        """
+
+        from .cache import reference_data
+
+        snapshot = reference_data.snapshot()
+        now = datetime.now(pytz.UTC)
+
+        # deadlines can be rescheduled so are taken from each new version of the reference data
+        if snapshot.version != self._version:
+            gameweeks_df = snapshot.gameweeks.sort("deadline_time")
+
+            self._deadlines = gameweeks_df["deadline_time"].to_list()
+            self._gameweek_ids = gameweeks_df["gameweek_id"].to_list()
+            self._finalised_id = gameweeks_df.filter("data_checked")["gameweek_id"].max() or 0
+            self._version = snapshot.version
+            self._until = None
+
+        elif self._index is not None and (self._until is None or now < self._until):
+            return
+
+        # before the first deadline of the season the first gameweek is current
+        index = max(bisect.bisect_right(self._deadlines, now) - 1, 0)
+
+        self._until = self._deadlines[index + 1] if index + 1 < len(self._deadlines) else None
+
+        if index == self._index:
+            return
+
+        previous_id = self._gameweek_ids[self._index] if self._index is not None else None
+        self._index = index
+
+        if self._gameweek_ids[index] != previous_id:
+            self._notify(self._gameweek_ids[index])
+
+    def _notify(self, gameweek_id: int):
+        """
+        Calls every subscriber with the new gameweek id, running any that are async in the background
+        """
+
+        for callback in self._subscribers:
+            result = callback(gameweek_id)
+
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result)
+
+    def start(self):
+        """
+        Starts waking at each deadline to notify subscribers of the rollover as it happens
+        """
+
+        async def run():
+            while True:
+                self._tick()
+
+                # wake regularly as well in case the deadline is rescheduled
+                wait_secs = settings.reference_check_interval_secs
+
+                if self._until is not None:
+                    wait_secs = min(wait_secs, (self._until - datetime.now(pytz.UTC)).total_seconds())
+
+                await asyncio.sleep(max(wait_secs, 0))
+
+        self._task = asyncio.create_task(run())
+
+    async def stop(self):
+        """
+        Stops waking at each deadline
+        """
+
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+gameweek_clock = GameweekClock()
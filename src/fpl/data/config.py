@@ -13,95 +13,122 @@ CLEAN_SHEET_POINTS = {
     "Midfielder": 1
 }
 
+
+def increase(stat: str, per: int = 1) -> pl.Expr:
+    """
+    Returns the number of multiples of per the stat has gone up by since the last refresh
+    """
+
+    return (pl.col(f"stats.{stat}") // per - pl.col(f"stats.{stat}_cache") // per).clip(lower_bound=0)
+
+
+def decrease(stat: str) -> pl.Expr:
+    """
+    Returns the amount the stat has gone down by since the last refresh
+    """
+
+    return (pl.col(f"stats.{stat}_cache") - pl.col(f"stats.{stat}")).clip(lower_bound=0)
+
+
+def when_position(positions: dict[str, int], events: pl.Expr) -> pl.Expr:
+    """
+    Returns the events for players in one of the positions, otherwise none
+    """
+
+    return pl.when(pl.col("position_name").is_in(list(positions))).then(events).otherwise(0)
+
+
+# each event is emitted once per unit given by events, which is evaluated for every player alongside the points
+# the event is worth
 SCORING_CONFIG = (
     # played 60 minutes
     # {
-    #     "filter": (pl.col("stats.minutes").gt(pl.col("stats.minutes_cache"))) & (pl.col("stats.minutes").gt(60)),
+    #     "events": (pl.col("stats.minutes").gt(pl.col("stats.minutes_cache"))) & (pl.col("stats.minutes").gt(60)),
     #     "event": "Played 60 Minutes",
     #     "points": 1
     # },
     # clean sheet
     {
-        "filter": (pl.col("stats.clean_sheets").gt(pl.col("stats.clean_sheets_cache"))) & (pl.col("position_name").is_in(CLEAN_SHEET_POINTS.keys())),
+        "events": when_position(CLEAN_SHEET_POINTS, increase("clean_sheets")),
         "event": "Clean Sheet",
         "badge_colour": "green",
-        "points": pl.col("position_name").replace_strict(CLEAN_SHEET_POINTS).alias("points")
+        "points": pl.col("position_name").replace_strict(CLEAN_SHEET_POINTS, default=0)
     },
     # goal scored
     {
-        "filter": pl.col("stats.goals_scored").gt(pl.col("stats.goals_scored_cache")),
+        "events": increase("goals_scored"),
         "event": "Goal Scored",
         "badge_colour": "green",
-        "points": pl.col("position_name").replace_strict(GOALS_POINTS).alias("points")
+        "points": pl.col("position_name").replace_strict(GOALS_POINTS, default=0)
     },
     # goal assisted
     {
-        "filter": pl.col("stats.assists").gt(pl.col("stats.assists_cache")),
+        "events": increase("assists"),
         "event": "Goal Assisted",
         "badge_colour": "green",
-        "points":  3
+        "points": 3
     },
     # penalty missed
     {
-        "filter": pl.col("stats.penalties_missed").gt(pl.col("stats.penalties_missed_cache")),
+        "events": increase("penalties_missed"),
         "event": "Penalty Missed",
         "badge_colour": "red",
         "points": -2
     },
     # own goal scored
     {
-        "filter": pl.col("stats.own_goals").gt(pl.col("stats.own_goals_cache")),
+        "events": increase("own_goals"),
         "event": "Own Goal Scored",
         "badge_colour": "red",
         "points": -2
     },
     # lost clean sheet
     {
-        "filter": (pl.col("stats.clean_sheets").lt(pl.col("stats.clean_sheets_cache")) & (pl.col("position_name").is_in(CLEAN_SHEET_POINTS.keys()))),
+        "events": when_position(CLEAN_SHEET_POINTS, decrease("clean_sheets")),
         "event": "Lost Clean Sheet",
         "badge_colour": "red",
-        "points":   pl.col("position_name").replace_strict(CLEAN_SHEET_POINTS).mul(-1).alias("points")
+        "points": pl.col("position_name").replace_strict(CLEAN_SHEET_POINTS, default=0).mul(-1)
     },
     # 3 shots saved
     {
-        "filter": (pl.col("stats.saves").gt(pl.col("stats.saves_cache"))) & (pl.col("stats.saves").mod(3).eq(0)),
+        "events": increase("saves", per=3),
         "event": "3 Shots Saved",
         "badge_colour": "green",
-        "points":  1
+        "points": 1
     },
     # 2 goals conceded
     {
-        "filter": (pl.col("stats.goals_conceded").gt(pl.col("stats.goals_conceded_cache"))) & (pl.col("stats.goals_conceded").mod(2).eq(0)),
+        "events": increase("goals_conceded", per=2),
         "event": "2 Goals Conceded",
         "badge_colour": "red",
         "points": -1
     },
     # penalty saved
     {
-        "filter": pl.col("stats.penalties_saved").gt(pl.col("stats.penalties_saved_cache")),
+        "events": increase("penalties_saved"),
         "event": "Penalty Saved",
         "badge_colour": "green",
-        "points":  5
+        "points": 5
     },
     # yellow card
     {
-        "filter": pl.col("stats.yellow_cards").gt(pl.col("stats.yellow_cards_cache")),
+        "events": increase("yellow_cards"),
         "event": "Yellow Card",
         "badge_colour": "red",
         "points": -1
     },
     # red card
     {
-        "filter": pl.col("stats.red_cards").gt(pl.col("stats.red_cards_cache")),
+        "events": increase("red_cards"),
         "event": "Red Card",
         "badge_colour": "red",
         "points": -3
     },
-    # bonus
+    # bonus is a single event worth the new total rather than one per point
     {
-        "filter": pl.col("stats.bonus").gt(pl.col("stats.bonus_cache")),
+        "events": pl.col("stats.bonus").gt(pl.col("stats.bonus_cache")),
         "event": "Bonus",
         "badge_colour": "green",
-        "points": pl.col("stats.bonus").alias("points")
+        "points": pl.col("stats.bonus")
     },
 )
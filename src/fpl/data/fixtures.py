@@ -0,0 +1,117 @@
+import httpx
+import polars as pl
+
+from .schemas import Fixture, to_frame
+
+
+class FixtureStore():
+    """
+    Holds the season's fixtures joined to their teams, patching the scores of live fixtures from the
+    gameweek's fixtures
+    """
+
+    col_map = {
+        "team_h": "home_team_id",
+        "team_h_score": "home_team_score",
+        "team_a": "away_team_id",
+        "team_a_score": "away_team_score",
+    }
+
+    # columns which change while a fixture is being played
+    live_fields = (
+        "id",
+        "home_team_score",
+        "away_team_score",
+        "minutes",
+        "started",
+        "finished",
+        "finished_provisional"
+    )
+
+    season_fields = (
+        "id",
+        "event",
+        "kickoff_time",
+        "home_team_id",
+        "away_team_id",
+        "home_team_name",
+        "home_team_logo",
+        "away_team_name",
+        "away_team_logo",
+    ) + live_fields[1:]
+
+    def __init__(self):
+        self._df: pl.DataFrame | None = None
+        self._gameweek_id: int | None = None
+
+    def season(self) -> pl.DataFrame:
+        """
+        Returns every fixture in the season
+        """
+
+        if self._df is None:
+            return pl.DataFrame()
+
+        return self._df
+
+    def gameweek(self, gameweek_id: int) -> pl.DataFrame:
+        """
+        Returns the fixtures for the gameweek
+        """
+
+        if self._df is None:
+            return pl.DataFrame()
+
+        return self._df.filter(pl.col("event") == gameweek_id)
+
+    async def load(self, client: httpx.AsyncClient, gameweek_id: int):
+        """
+        Loads every fixture in the season
+        """
+
+        from .api import get_parsed
+        from .cache import reference_data
+
+        team_index = reference_data.snapshot().team_index
+
+        def parse(fixtures: list[Fixture]) -> pl.DataFrame:
+            df = (
+                to_frame(fixtures, Fixture)
+                .with_columns(pl.col("kickoff_time").str.strptime(pl.Datetime, "%Y-%m-%dT%H:%M:%SZ"))
+                .rename(self.col_map)
+            )
+
+            df = team_index.take(df, on="away_team_id").rename({"team_name": "away_team_name", "logo": "away_team_logo"})
+            df = team_index.take(df, on="home_team_id").rename({"team_name": "home_team_name", "logo": "home_team_logo"})
+
+            return df.select(self.season_fields)
+
+        self._df = await get_parsed(client, "fixtures/", list[Fixture], parse)
+        self._gameweek_id = gameweek_id
+
+    async def refresh(self, client: httpx.AsyncClient, gameweek_id: int):
+        """
+        Patches the fixtures being played in the gameweek with their latest scores, minutes and status
+        """
+
+        from .api import get_parsed
+
+        # reload the season each gameweek to pick up rescheduled fixtures
+        if self._df is None or self._gameweek_id != gameweek_id:
+            await self.load(client, gameweek_id)
+
+        def parse(fixtures: list[Fixture]) -> pl.DataFrame:
+            return (
+                to_frame(fixtures, Fixture)
+                .filter(pl.col("started") == True)
+                .rename(self.col_map)
+                .select(self.live_fields)
+            )
+
+        live_df = await get_parsed(client, "fixtures/", list[Fixture], parse, params={"event": gameweek_id})
+
+        if not live_df.is_empty():
+            self._df = self._df.update(live_df, on="id")
+
+
+fixture_store = FixtureStore()
@@ -0,0 +1,126 @@
+import asyncio
+import re
+from collections import deque
+from typing import Awaitable, Callable
+
+
+def endpoint(url: str) -> str:
+    """
+    Returns the endpoint for the url with its ids replaced e.g. entry/{id}/event/{id}/picks/
+    """
+
+    return re.sub(r"\d+", "{id}", url)
+
+
+class LatencyTracker():
+    """
+    Keeps recent latencies for each endpoint to derive the threshold after which a request is hedged
+    """
+
+    def __init__(self, sample_size: int, min_samples: int, percentile: float):
+        self._sample_size = sample_size
+        self._min_samples = min_samples
+        self._percentile = percentile
+        self._latencies: dict[str, deque[float]] = {}
+
+    def record(self, endpoint: str, latency_secs: float):
+        """
+        Records the latency of a successful request to the endpoint
+        """
+
+        self._latencies.setdefault(endpoint, deque(maxlen=self._sample_size)).append(latency_secs)
+
+    def threshold(self, endpoint: str) -> float | None:
+        """
+        Returns the latency percentile for the endpoint or none until enough requests have been recorded
+        """
+
+        latencies = self._latencies.get(endpoint)
+
+        if not latencies or len(latencies) < self._min_samples:
+            return None
+
+        return sorted(latencies)[int(len(latencies) * self._percentile) - 1]
+
+
+class HedgeBudget():
+    """
+    Caps hedged requests to a fraction of all requests, earning a fraction of a hedge for each request made
+    """
+
+    def __init__(self, ratio: float, burst: int):
+        self._ratio = ratio
+        self._burst = burst
+        self._tokens = float(burst)
+        self.sent = 0
+        self.won = 0
+
+    def earn(self):
+        """
+        Adds the share of a hedge earned by making a request
+        """
+
+        self._tokens = min(self._burst, self._tokens + self._ratio)
+
+    def spend(self) -> bool:
+        """
+        Returns whether a hedge can be sent, using up its share of the budget if so
+        """
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        self.sent += 1
+        return True
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns counts of hedges sent and hedges that answered first
+        """
+
+        return {
+            "sent": self.sent,
+            "won": self.won
+        }
+
+
+async def hedged(request: Callable[[], Awaitable], threshold_secs: float | None, budget: HedgeBudget) -> any:
+    """
+    Returns the result of the request, sending a duplicate if it takes longer than the threshold and
+    returning whichever succeeds first
+    """
+
+    budget.earn()
+
+    primary = asyncio.ensure_future(request())
+
+    if threshold_secs is None:
+        return await primary
+
+    pending = {primary}
+
+    try:
+        done, pending = await asyncio.wait(pending, timeout=threshold_secs)
+
+        if done or not budget.spend():
+            return await primary
+
+        hedge = asyncio.ensure_future(request())
+        pending.add(hedge)
+
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            succeeded = [task for task in done if task.exception() is None]
+
+            if succeeded:
+                if hedge in succeeded:
+                    budget.won += 1
+                return succeeded[0].result()
+
+            # fall back to the other request if the first to finish failed
+            if not pending:
+                return done.pop().result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,74 @@
+import time
+
+import httpx
+import polars as pl
+
+from ..settings import settings
+from .schemas import Chip, EntryHistory, History, to_frame
+
+
+class HistoryStore():
+    """
+    Holds each entry's points, totals, transfer costs and chips for the season, fetching them again once a new
+    gameweek has started or been finalised, or while the gameweek being played is open for callers that show it
+    """
+
+    col_map = {
+        "event": "gameweek_id"
+    }
+
+    gameweek_fields = (
+        "gameweek_id",
+        "entry_id",
+        "points",
+        "total_points",
+        "event_transfers_cost"
+    )
+
+    chip_fields = (
+        "gameweek_id",
+        "name"
+    )
+
+    def __init__(self):
+        # entry id -> (current and finalised gameweek ids when fetched, time fetched, gameweeks, chips)
+        self._entries: dict[int, tuple[tuple[int, int], float, pl.DataFrame, pl.DataFrame]] = {}
+
+    async def get(self, client: httpx.AsyncClient, entry_id: int, live: bool = False) -> tuple[pl.DataFrame, pl.DataFrame]:
+        """
+        Returns the gameweeks and chips played for the entry, with the totals of the gameweek being played no older
+        than the entry cache ttl if live
+        """
+
+        from .api import current_gameweek_id, finalised_gameweek_id, get_parsed
+
+        # rows for a new gameweek appear at its deadline and its points stop changing once finalised
+        version = (current_gameweek_id(), finalised_gameweek_id())
+
+        entry = self._entries.get(entry_id)
+
+        # totals for the gameweek being played keep changing until it is finalised
+        if entry and entry[0] == version and (
+                not live or version[0] <= version[1] or time.monotonic() - entry[1] < settings.cache_entry_ttl_secs):
+            return entry[2:]
+
+        def parse(history: History) -> tuple[pl.DataFrame, pl.DataFrame]:
+            return (
+                to_frame(history.current, EntryHistory)
+                .with_columns(entry_id=entry_id)
+                .with_columns(pl.col("event").cast(pl.Int32))
+                .rename(self.col_map)
+                .select(self.gameweek_fields),
+                to_frame(history.chips, Chip)
+                .rename(self.col_map)
+                .select(self.chip_fields)
+            )
+
+        gameweeks_df, chips_df = await get_parsed(client, f"entry/{entry_id}/history/", History, parse)
+
+        self._entries[entry_id] = (version, time.monotonic(), gameweeks_df, chips_df)
+
+        return gameweeks_df, chips_df
+
+
+history_store = HistoryStore()
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+
+class AdaptiveLimiter():
+    """
+    Limits concurrent requests to the FPL API, halving the limit when the API is rate limiting or failing and
+    raising it by one for each window of requests answered within the latency target
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, latency_target_secs: float):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target_secs = latency_target_secs
+        self.in_flight = 0
+        self.waiting = 0
+        self._healthy = 0
+        self._last_decrease = 0.0
+        self._released = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._released:
+            self.waiting += 1
+            try:
+                await self._released.wait_for(lambda: self.in_flight < self.limit)
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+
+    async def __aexit__(self, *exc_info):
+        async with self._released:
+            self.in_flight -= 1
+            self._released.notify_all()
+
+    def record(self, status_code: int | None, latency_secs: float):
+        """
+        Adjusts the limit from the outcome of a request, where no status code means the request failed
+        """
+
+        if status_code is None or status_code == 429 or status_code >= 500:
+            now = time.monotonic()
+
+            # requests already in flight when the api started struggling only count as one decrease
+            if now - self._last_decrease >= self.latency_target_secs:
+                self.limit = max(self.minimum, self.limit // 2)
+                self._last_decrease = now
+
+            self._healthy = 0
+
+        elif latency_secs <= self.latency_target_secs:
+            self._healthy += 1
+
+            if self._healthy >= self.limit:
+                self.limit = min(self.maximum, self.limit + 1)
+                self._healthy = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the current limit, requests in flight and requests queued
+        """
+
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting
+        }
@@ -0,0 +1,41 @@
+import polars as pl
+
+
+class DenseIndex():
+    """
+    Places each row of a table at the position of its integer id so the rows for a batch of ids are gathered by
+    position rather than found with a hash join
+    """
+
+    def __init__(self, df: pl.DataFrame, key: str):
+        self.key = key
+        self._size = (df[key].max() or 0) + 1
+
+        # ids missing from the table are null rows
+        self._df = (
+            pl.DataFrame({key: pl.arange(0, self._size, eager=True)})
+            .cast({key: df.schema[key]})
+            .join(df, on=key, how="left")
+            .drop(key)
+        )
+
+    def take(self, df: pl.DataFrame, on: str | None = None, suffix: str = "") -> pl.DataFrame:
+        """
+        Returns the frame with the columns of the row for the id in each of its rows appended, which are null
+        for ids not in the table
+        """
+
+        ids = df[on or self.key]
+        low, high = ids.min(), ids.max()
+
+        # ids added since the table was built have no row, while an empty frame or one whose ids are all null has
+        # no range of ids to check
+        if low is not None and (low < 0 or high >= self._size):
+            ids = ids.set(~ids.is_between(0, self._size - 1), None)
+
+        rows = self._df[ids.cast(pl.UInt32)]
+
+        if suffix:
+            rows = rows.rename({col: f"{col}{suffix}" for col in rows.columns})
+
+        return df.hstack(rows)
@@ -0,0 +1,146 @@
+import asyncio
+import collections
+import dataclasses
+import hashlib
+from datetime import datetime
+from typing import Awaitable, Callable
+
+import httpx
+import polars as pl
+
+from ..settings import settings
+from .api import api_client, current_gameweek_id, get_fixtures, get_player_points
+from .scheduler import poll_interval
+
+
+@dataclasses.dataclass(frozen=True)
+class Snapshot:
+    version: int
+    # identifies the snapshot by its gameweek and content, so is the same in every worker polling the same data,
+    # unlike the version which only orders the snapshots in this worker
+    key: str
+    gameweek_id: int
+    data: pl.DataFrame
+    updated: datetime
+
+
+class Poller():
+    """
+    Fetches live data shared by every session once per interval and publishes it as versioned snapshots, keeping
+    the last few so sessions can compare the latest with the version they last saw
+    """
+
+    def __init__(self, resources: dict[str, Callable[[httpx.AsyncClient, int], Awaitable[pl.DataFrame]]]):
+        self._resources = resources
+        self._snapshots: dict[str, Snapshot] = {}
+        # resource -> latest snapshots, oldest first
+        self._history: dict[str, collections.deque[Snapshot]] = {}
+        self._published = asyncio.Condition()
+        self._task: asyncio.Task | None = None
+
+    def snapshot(self, resource: str, key: str | None = None) -> Snapshot | None:
+        """
+        Returns the latest snapshot of the resource or the snapshot with the key, which is none once it is no
+        longer kept
+        """
+
+        if key is None:
+            return self._snapshots.get(resource)
+
+        for snapshot in reversed(self._history.get(resource, ())):
+            if snapshot.key == key:
+                return snapshot
+
+        return None
+
+    async def subscribe(self, resource: str, version: int = 0, timeout: float | None = None) -> Snapshot | None:
+        """
+        Waits for and returns a snapshot of the resource newer than the version, or the latest snapshot, which is
+        none before the first poll, once the timeout has passed
+        """
+
+        def is_newer() -> bool:
+            snapshot = self._snapshots.get(resource)
+            return snapshot is not None and snapshot.version > version
+
+        async with self._published:
+            try:
+                await asyncio.wait_for(self._published.wait_for(is_newer), timeout)
+            except TimeoutError:
+                pass
+
+            return self._snapshots.get(resource)
+
+    async def poll(self):
+        """
+        Fetches every resource for the current gameweek and publishes any that have changed
+        """
+
+        gameweek_id = current_gameweek_id()
+        client = api_client()
+
+        results = await asyncio.gather(
+            *(fetch(client, gameweek_id) for fetch in self._resources.values()), return_exceptions=True)
+
+        async with self._published:
+            for resource, data in zip(self._resources, results):
+
+                # keep serving the previous snapshot until the next successful poll
+                if isinstance(data, Exception):
+                    continue
+
+                previous = self._snapshots.get(resource)
+                key = f"{gameweek_id}-{hashlib.blake2b(data.write_csv().encode(), digest_size=8).hexdigest()}"
+
+                if previous and previous.key == key:
+                    continue
+
+                self._snapshots[resource] = Snapshot(
+                    version=previous.version + 1 if previous else 1,
+                    key=key,
+                    gameweek_id=gameweek_id,
+                    data=data,
+                    updated=datetime.now()
+                )
+
+                self._history.setdefault(
+                    resource, collections.deque(maxlen=settings.poller_history_size)).append(self._snapshots[resource])
+
+            self._published.notify_all()
+
+    def start(self):
+        """
+        Starts polling in the background
+        """
+
+        async def run():
+            while True:
+                interval_secs = settings.refresh_interval_secs
+
+                try:
+                    await self.poll()
+                    interval_secs = poll_interval()
+                except Exception:
+                    # keep serving the latest snapshots and try again at the fastest interval, since sessions
+                    # wait on the poller for every update
+                    pass
+
+                await asyncio.sleep(interval_secs)
+
+        self._task = asyncio.create_task(run())
+
+    async def stop(self):
+        """
+        Stops polling
+        """
+
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+poller = Poller({
+    "fixtures": get_fixtures,
+    "player_points": get_player_points,
+})
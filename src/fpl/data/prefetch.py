@@ -0,0 +1,105 @@
+import asyncio
+
+import polars as pl
+
+from ..settings import settings
+from .api import (api_client, get_entry_gameweek, get_entry_points_history,
+                  get_transfers, iter_league_table)
+from .cache import reference_data
+from .clock import gameweek_clock
+
+
+class Prefetcher():
+    """
+    Warms the picks, chip, transfers and history of every entry in the tracked leagues once each gameweek deadline
+    has passed, so the first page views after the deadline don't all fetch them at once. only the worker refreshing
+    the reference data prefetches, with the other workers reading what it saved from the shared entry store
+    """
+
+    def __init__(self):
+        self._league_ids: list[str] = []
+        self._task: asyncio.Task | None = None
+        self.prefetched = 0
+        self.failed = 0
+
+    def start(self, league_ids: list[str]):
+        """
+        Starts prefetching the leagues each time the gameweek rolls over
+        """
+
+        self._league_ids = league_ids
+        gameweek_clock.subscribe(self._rollover)
+
+    async def stop(self):
+        """
+        Stops any prefetch in progress
+        """
+
+        self._league_ids = []
+
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _rollover(self, gameweek_id: int):
+        """
+        Replaces any prefetch still running for the previous gameweek with one for the new gameweek
+        """
+
+        # every worker prefetching would multiply the requests at the deadline by the number of workers
+        if not self._league_ids or not reference_data.lead():
+            return
+
+        if self._task:
+            self._task.cancel()
+
+        self._task = asyncio.ensure_future(self.prefetch(gameweek_id))
+
+    async def prefetch(self, gameweek_id: int):
+        """
+        Fetches every entry in the tracked leagues for the gameweek, starting entries at a limited rate
+        """
+
+        # the api is unavailable while the game updates after the deadline
+        await asyncio.sleep(settings.prefetch_delay_secs)
+
+        client = api_client()
+        entries = []
+
+        async def prefetch_entry(entry_id: int, league_df: pl.DataFrame):
+            await asyncio.gather(
+                get_entry_gameweek(client, entry_id, gameweek_id),
+                get_entry_points_history(client, entry_id, gameweek_id - 1),
+                get_transfers(client, entry_id, gameweek_id, league_df)
+            )
+
+        for league_id in self._league_ids:
+            try:
+                async for league_df in iter_league_table(client, league_id):
+                    for entry_id in league_df["entry_id"].to_list():
+                        entries.append(asyncio.ensure_future(prefetch_entry(entry_id, league_df)))
+                        await asyncio.sleep(1 / settings.prefetch_entries_per_sec)
+            except Exception:
+                # pages of the league that couldn't be fetched are left to the first page view
+                pass
+
+        # entries that couldn't be fetched are left to the first page view
+        for result in await asyncio.gather(*entries, return_exceptions=True):
+            if isinstance(result, Exception):
+                self.failed += 1
+            else:
+                self.prefetched += 1
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns counts of entries prefetched and entries that failed
+        """
+
+        return {
+            "prefetched": self.prefetched,
+            "failed": self.failed
+        }
+
+
+prefetcher = Prefetcher()
@@ -0,0 +1,116 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from ..settings import settings
+
+# time to live in seconds for each endpoint given the url match and current gameweek id,
+# none caches forever, zero is never cached and endpoints not listed are never cached
+TtlRule = tuple[re.Pattern, Callable[[re.Match, int], float | None]]
+
+ENDPOINT_TTLS: tuple[TtlRule, ...] = (
+    (
+        re.compile(r"fixtures/"),
+        lambda match, gameweek_id: settings.cache_fixtures_ttl_secs
+    ),
+    # picks can't change once the gameweek deadline has passed
+    (
+        re.compile(r"entry/\d+/event/(?P<gameweek_id>\d+)/picks/"),
+        lambda match, gameweek_id: None if int(match["gameweek_id"]) <= gameweek_id else 0
+    ),
+    (
+        re.compile(r"entry/\d+/transfers/"),
+        lambda match, gameweek_id: settings.cache_entry_ttl_secs
+    ),
+    (
+        re.compile(r"leagues-classic/\d+/standings/"),
+        lambda match, gameweek_id: settings.cache_standings_ttl_secs
+    ),
+)
+
+
+class ResponseCache():
+    """
+    Caches parsed API responses with a time to live per endpoint, evicting the least recently used when full
+    """
+
+    def __init__(self, ttls: tuple[TtlRule, ...] = ENDPOINT_TTLS, max_entries: int = settings.cache_max_entries):
+        self._ttls = ttls
+        self._max_entries = max_entries
+        # key -> (expiry time or none if never expires, gameweek id in the url if any, data)
+        self._entries: OrderedDict[Hashable, tuple[float | None, int | None, any]] = OrderedDict()
+        self._gameweek_id: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> any:
+        """
+        Returns the cached data for the key or none if missing or expired
+        """
+
+        entry = self._entries.get(key)
+
+        if entry is None or (entry[0] is not None and entry[0] <= time.monotonic()):
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, key: Hashable, url: str, data: any):
+        """
+        Caches the data for the key if the url's endpoint is cacheable
+        """
+
+        for pattern, ttl in self._ttls:
+            if match := pattern.fullmatch(url):
+                break
+        else:
+            return
+
+        ttl_secs = ttl(match, self._gameweek_id or 0)
+
+        if ttl_secs == 0:
+            return
+
+        expiry = None if ttl_secs is None else time.monotonic() + ttl_secs
+        gameweek_id = int(match["gameweek_id"]) if "gameweek_id" in pattern.groupindex else None
+
+        self._entries[key] = (expiry, gameweek_id, data)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def observe_gameweek(self, gameweek_id: int):
+        """
+        Invalidates entries that depend on the current gameweek when it rolls over
+        """
+
+        if self._gameweek_id is not None and gameweek_id != self._gameweek_id:
+            self.invalidate(gameweek_id)
+
+        self._gameweek_id = gameweek_id
+
+    def invalidate(self, gameweek_id: int):
+        """
+        Removes entries that expire and entries for the gameweek or later
+        """
+
+        for key, (expiry, entry_gameweek_id, _) in list(self._entries.items()):
+            if expiry is not None or (entry_gameweek_id is not None and entry_gameweek_id >= gameweek_id):
+                del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns counts of cache hits, misses and entries
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries)
+        }
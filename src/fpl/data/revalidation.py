@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import httpx
+
+
+class Revalidator():
+    """
+    Remembers the validators and parsed result of each response so unchanged responses are not parsed again
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        # key -> (etag, last modified, parsed result)
+        self._entries: OrderedDict[Hashable, tuple[str | None, str | None, any]] = OrderedDict()
+        self.revalidated = 0
+
+    def headers(self, key: Hashable) -> dict[str, str]:
+        """
+        Returns the conditional request headers for the key
+        """
+
+        if key not in self._entries:
+            return {}
+
+        etag, last_modified, _ = self._entries[key]
+        headers = {}
+
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        return headers
+
+    def is_unchanged(self, key: Hashable, response: httpx.Response) -> bool:
+        """
+        Returns whether the response confirms the remembered result for the key is still current
+        """
+
+        return response.status_code == 304 and key in self._entries
+
+    def parse(self, key: Hashable, response: httpx.Response, parse: Callable[[bytes], any]) -> any:
+        """
+        Returns the parsed response content, reusing the remembered result if the response is unchanged
+        """
+
+        if self.is_unchanged(key, response):
+            self._entries.move_to_end(key)
+            self.revalidated += 1
+            return self._entries[key][2]
+
+        parsed = parse(response.content)
+
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+
+        if etag or last_modified:
+            self._entries[key] = (etag, last_modified, parsed)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.pop(key, None)
+
+        return parsed
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import polars as pl
+import pytz
+
+from ..settings import settings
+from .clock import gameweek_clock
+from .fixtures import fixture_store
+
+
+def poll_interval(now: datetime | None = None) -> float:
+    """
+    Returns the seconds to wait before next polling live data, based on the state of the season's fixtures and
+    the next gameweek deadline
+    """
+
+    fixtures_df = fixture_store.season()
+
+    if fixtures_df.is_empty():
+        return settings.refresh_interval_secs
+
+    now = (now or datetime.now(pytz.UTC)).astimezone(pytz.UTC)
+    next_deadline = gameweek_clock.next_deadline()
+
+    # poll as soon as the next deadline passes to pick up the new gameweek rather than sleeping through it
+    if next_deadline is not None:
+        until_deadline_secs = max((next_deadline - now).total_seconds(), settings.refresh_interval_secs)
+    else:
+        until_deadline_secs = settings.idle_interval_secs
+
+    # fixture kick-off times are utc without a timezone
+    now = now.replace(tzinfo=None)
+
+    kicked_off = fixtures_df.filter(pl.col("kickoff_time") <= now)
+
+    # poll fast while any match is being played
+    if not kicked_off.filter(pl.col("finished_provisional") == False).is_empty():
+        return settings.refresh_interval_secs
+
+    # poll slowly while waiting for bonus points to be confirmed
+    if not kicked_off.filter(pl.col("finished") == False).is_empty():
+        return settings.bonus_interval_secs
+
+    # otherwise sleep until the next kick-off, waking periodically to pick up rescheduled fixtures
+    next_kickoff = fixtures_df.filter(pl.col("kickoff_time") > now)["kickoff_time"].min()
+
+    if next_kickoff is None:
+        return min(settings.idle_interval_secs, until_deadline_secs)
+
+    return min(
+        max((next_kickoff - now).total_seconds(), settings.refresh_interval_secs),
+        settings.idle_interval_secs,
+        until_deadline_secs
+    )
@@ -0,0 +1,190 @@
+import types
+import typing
+
+import msgspec
+import polars as pl
+
+# only the fields used by the app are declared, every other field in the api responses is skipped when decoding
+
+DTYPES = {
+    bool: pl.Boolean,
+    float: pl.Float64,
+    int: pl.Int64,
+    str: pl.String
+}
+
+
+class Team(msgspec.Struct):
+    id: int
+    name: str
+
+
+class Player(msgspec.Struct):
+    id: int
+    web_name: str
+    team: int
+    element_type: int
+    photo: str
+
+
+class Position(msgspec.Struct):
+    id: int
+    singular_name: str
+
+
+class Gameweek(msgspec.Struct):
+    id: int
+    deadline_time: str
+    finished: bool
+    data_checked: bool
+
+
+class Bootstrap(msgspec.Struct):
+    teams: list[Team]
+    elements: list[Player]
+    element_types: list[Position]
+    events: list[Gameweek]
+
+
+class Fixture(msgspec.Struct):
+    id: int
+    event: int | None
+    kickoff_time: str | None
+    team_h: int
+    team_h_score: int | None
+    team_a: int
+    team_a_score: int | None
+    minutes: int
+    started: bool | None
+    finished: bool
+    finished_provisional: bool
+
+
+class LiveStats(msgspec.Struct):
+    assists: int
+    bonus: int
+    clean_sheets: int
+    goals_conceded: int
+    goals_scored: int
+    minutes: int
+    own_goals: int
+    penalties_missed: int
+    penalties_saved: int
+    red_cards: int
+    saves: int
+    total_points: int
+    yellow_cards: int
+
+
+class LiveElement(msgspec.Struct):
+    id: int
+    stats: LiveStats
+
+
+class Live(msgspec.Struct):
+    elements: list[LiveElement]
+
+
+class Pick(msgspec.Struct):
+    element: int
+    position: int
+    multiplier: int
+    is_captain: bool
+
+
+class EntryHistory(msgspec.Struct):
+    event: int
+    points: int
+    total_points: int
+    event_transfers_cost: int
+
+
+# transfer cost of an entry in a gameweek, leaving out the points which keep changing until the gameweek is
+# finalised
+class EntryGameweekCost(msgspec.Struct):
+    event_transfers_cost: int
+
+
+# picks, transfer cost and chip of an entry in a gameweek, all from one picks response, which no longer change
+# once the deadline has passed
+class EntryGameweek(msgspec.Struct):
+    active_chip: str | None
+    entry_history: EntryGameweekCost
+    picks: list[Pick]
+
+
+class Chip(msgspec.Struct):
+    name: str
+    event: int
+
+
+class History(msgspec.Struct):
+    current: list[EntryHistory]
+    chips: list[Chip]
+
+
+class Standing(msgspec.Struct):
+    entry: int
+    player_name: str
+    entry_name: str
+    total: int
+
+
+class Standings(msgspec.Struct):
+    has_next: bool
+    page: int
+    results: list[Standing]
+
+
+class LeagueStandings(msgspec.Struct):
+    standings: Standings
+
+
+class Transfer(msgspec.Struct):
+    element_in: int
+    element_out: int
+    entry: int
+    event: int
+
+
+def polars_schema(struct: type[msgspec.Struct], prefix: str = "") -> dict[str, pl.DataType]:
+    """
+    Returns the polars column types for the fields of the struct
+    """
+
+    def dtype(hint: type) -> pl.DataType:
+        # optional fields are nullable columns of the underlying type
+        if isinstance(hint, types.UnionType):
+            hint = next(arg for arg in typing.get_args(hint) if arg is not types.NoneType)
+        return DTYPES[hint]
+
+    hints = typing.get_type_hints(struct)
+
+    return {f"{prefix}{name}": dtype(hints[name]) for name in struct.__struct_fields__}
+
+
+def to_frame(items: list[msgspec.Struct], struct: type[msgspec.Struct]) -> pl.DataFrame:
+    """
+    Returns a frame with a typed column for each field of the decoded items
+    """
+
+    return pl.DataFrame(
+        {name: [getattr(item, name) for item in items] for name in struct.__struct_fields__},
+        schema=polars_schema(struct)
+    )
+
+
+def live_to_frame(live: Live) -> pl.DataFrame:
+    """
+    Returns a frame with a typed column for the id and each stat of the live elements
+    """
+
+    stats = [element.stats for element in live.elements]
+
+    return pl.DataFrame(
+        {
+            "id": [element.id for element in live.elements],
+            **{f"stats.{name}": [getattr(item, name) for item in stats] for name in LiveStats.__struct_fields__}
+        },
+        schema={"id": pl.Int64} | polars_schema(LiveStats, prefix="stats.")
+    )
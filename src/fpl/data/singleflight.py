@@ -0,0 +1,42 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable
+
+
+class SingleFlight():
+    """
+    Coalesces concurrent calls for the same key into one call whose result is shared by every caller
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """
+        Returns the result of the call for the key, joining a call already in flight if there is one
+        """
+
+        task = self._in_flight.get(key)
+
+        if task:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # a caller being cancelled must not cancel the call for everyone else waiting on it
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns counts of calls made, calls coalesced and calls currently in flight
+        """
+
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight)
+        }
@@ -0,0 +1,179 @@
+import asyncio
+import sqlite3
+import threading
+
+import msgspec
+
+from ..settings import settings
+from .schemas import EntryGameweek, Transfer
+from .singleflight import SingleFlight
+
+
+class EntryStore():
+    """
+    Keeps each entry's picks, chip and transfers for gameweeks whose deadline has passed, which can no longer
+    change, in memory and in a local database that survives restarts
+    """
+
+    # table -> type of the data stored for each entry and gameweek
+    tables = {
+        "gameweeks": EntryGameweek,
+        "transfers": list[Transfer],
+    }
+
+    def __init__(self, path: str):
+        self._path = path
+        self._connection: sqlite3.Connection | None = None
+        # connection is shared with the threads writing to the database
+        self._lock = threading.Lock()
+        # (table, entry id, gameweek id) -> data
+        self._entries: dict[tuple[str, int, int], any] = {}
+        # gameweeks read from the database for each table
+        self._loaded: set[tuple[str, int]] = set()
+        self._loading = SingleFlight()
+        self._pending: list[tuple[str, int, int, bytes]] = []
+        self._flush_task: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def open(self):
+        """
+        Opens the database, creating a table for each type of data if missing
+        """
+
+        self._connection = sqlite3.connect(self._path, check_same_thread=False)
+
+        with self._lock, self._connection:
+            # lets other workers read while one is writing
+            self._connection.execute("PRAGMA journal_mode=WAL")
+
+            for table in self.tables:
+                self._connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    "gameweek_id INTEGER NOT NULL, "
+                    "entry_id INTEGER NOT NULL, "
+                    "data BLOB NOT NULL, "
+                    "PRIMARY KEY (gameweek_id, entry_id))"
+                )
+
+    async def close(self):
+        """
+        Writes any pending data and closes the database
+        """
+
+        if self._flush_task:
+            await self._flush_task
+
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    async def get(self, table: str, entry_id: int, gameweek_id: int) -> any:
+        """
+        Returns the stored data for the entry and gameweek or none if not stored
+        """
+
+        if (table, gameweek_id) not in self._loaded:
+            await self._loading.do((table, gameweek_id), lambda: self._load(table, gameweek_id))
+
+        data = self._entries.get((table, entry_id, gameweek_id))
+
+        # another worker may have saved the entry since the gameweek was read
+        if data is None:
+            data = await self._load_entry(table, entry_id, gameweek_id)
+
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return data
+
+    def put(self, table: str, entry_id: int, gameweek_id: int, data: any):
+        """
+        Stores the data for the entry and gameweek, writing it to the database in the background
+        """
+
+        self._entries[(table, entry_id, gameweek_id)] = data
+        self._pending.append((table, entry_id, gameweek_id, msgspec.json.encode(data)))
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush())
+
+    async def _load(self, table: str, gameweek_id: int):
+        """
+        Reads the stored data for every entry in the gameweek into memory
+        """
+
+        if self._connection is None:
+            return
+
+        def read() -> list[tuple[int, bytes]]:
+            with self._lock:
+                return self._connection.execute(
+                    f"SELECT entry_id, data FROM {table} WHERE gameweek_id = ?", (gameweek_id,)).fetchall()
+
+        decoder = msgspec.json.Decoder(self.tables[table])
+
+        for entry_id, data in await asyncio.to_thread(read):
+            self._entries.setdefault((table, entry_id, gameweek_id), decoder.decode(data))
+
+        self._loaded.add((table, gameweek_id))
+
+    async def _load_entry(self, table: str, entry_id: int, gameweek_id: int) -> any:
+        """
+        Reads the stored data for the entry and gameweek into memory, returning none if not stored
+        """
+
+        if self._connection is None:
+            return None
+
+        def read() -> tuple[bytes] | None:
+            with self._lock:
+                return self._connection.execute(
+                    f"SELECT data FROM {table} WHERE gameweek_id = ? AND entry_id = ?", (gameweek_id, entry_id)
+                ).fetchone()
+
+        row = await asyncio.to_thread(read)
+
+        if row is None:
+            return None
+
+        data = msgspec.json.decode(row[0], type=self.tables[table])
+
+        return self._entries.setdefault((table, entry_id, gameweek_id), data)
+
+    async def _flush(self):
+        """
+        Writes pending data to the database in batches until there is none left
+        """
+
+        # let every caller in the current batch of requests add its data before writing
+        await asyncio.sleep(0)
+
+        while self._pending and self._connection:
+            rows, self._pending = self._pending, []
+
+            def write():
+                with self._lock, self._connection:
+                    for table in self.tables:
+                        self._connection.executemany(
+                            f"INSERT OR REPLACE INTO {table} (entry_id, gameweek_id, data) VALUES (?, ?, ?)",
+                            [row[1:] for row in rows if row[0] == table]
+                        )
+
+            await asyncio.to_thread(write)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns counts of store hits, misses and entries held in memory
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries)
+        }
+
+
+entry_store = EntryStore(settings.store_path)
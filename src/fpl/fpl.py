@@ -1,17 +1,41 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import reflex as rx
 from fastapi import FastAPI
 
 from . import styles
-from .data.cache import cache_data
+from .components.league_selector import LEAGUES
+from .data.api import close_api_client, open_api_client
+from .data.cache import reference_data
+from .data.clock import gameweek_clock
+from .data.poller import poller
+from .data.prefetch import prefetcher
+from .data.store import entry_store
 from .pages import *
 
 
 @asynccontextmanager
 async def startup(app: FastAPI):
-    cache_data()
+    entry_store.open()
+    # serve from the reference tables on disk without waiting for the api, which only has to be reached first
+    # when there are none, leaving the connections to warm and the fixtures to load on the first poll
+    warm_up = asyncio.create_task(open_api_client())
+    if not reference_data.load():
+        await reference_data.refresh()
+    reference_data.start()
+    gameweek_clock.start()
+    prefetcher.start([league.id for league in LEAGUES])
+    poller.start()
     yield
+    await poller.stop()
+    await prefetcher.stop()
+    await gameweek_clock.stop()
+    await reference_data.stop()
+    warm_up.cancel()
+    await asyncio.gather(warm_up, return_exceptions=True)
+    await close_api_client()
+    await entry_store.close()
 
 app = rx.App(style=styles.base_style, stylesheets=styles.base_stylesheets)
 app.register_lifespan_task(startup)
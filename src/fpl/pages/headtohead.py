@@ -5,8 +5,10 @@ from zoneinfo import ZoneInfo
 import polars as pl
 import reflex as rx
 
-from ..data.api import (api_client, current_gameweek_id, get_entry_extras,
-                        get_entry_picks, get_fixtures, get_player_points)
+from ..data.api import (api_client, current_gameweek_id, entry_extras,
+                        entry_picks, get_entry_gameweek)
+from ..data.cache import reference_data
+from ..data.poller import poller
 from ..templates import template
 
 OLLIE_ENTRY_ID = 1302247
@@ -191,71 +193,82 @@ class State(rx.State):
     @rx.event(background=True)
     async def get_data(self):
         """
-        Periodically get latest player points from the API
+        Get latest player points each time the shared poller publishes them
         """
 
-        from ..data.cache import PLAYERS_DF, TEAMS_DF
+        version = 0
 
         while True:
+            player_points = await poller.subscribe("player_points", version)
+            version = player_points.version
+            fixtures = (await poller.subscribe("fixtures")).data
+
+            # picks are for the gameweek of the points, which may have rolled over since the page was loaded
+            gameweek_id = player_points.gameweek_id
+
+            async with self:
+                self.gameweek_id = gameweek_id
+
+            client = api_client()
+
+            pete_gameweek, ollie_gameweek = await asyncio.gather(
+                get_entry_gameweek(client, PETE_ENTRY_ID, gameweek_id),
+                get_entry_gameweek(client, OLLIE_ENTRY_ID, gameweek_id)
+            )
+
+            pete_chip, pete_transfers_cost = entry_extras(pete_gameweek)
+            ollie_chip, ollie_transfers_cost = entry_extras(ollie_gameweek)
+
+            ollie_players_df = entry_picks(OLLIE_ENTRY_ID, ollie_gameweek)
+            pete_players_df = entry_picks(PETE_ENTRY_ID, pete_gameweek)
+
+            home_fixtures = fixtures.rename({"home_team_id": "team_id"}).select(["team_id", "status"])
+            away_fixtures = fixtures.rename({"away_team_id": "team_id"}).select(["team_id", "status"])
+
+            team_fixtures = pl.concat((home_fixtures, away_fixtures)).group_by(
+                "team_id").agg((pl.col("status") != "FT").sum().alias("remaining"))
+
+            points_df = reference_data.snapshot().player_index.take(player_points.data).join(team_fixtures, on="team_id")
+
+            # points_df = (
+            #     points_df.with_columns(
+            #         unused=(pl.col("stats.minutes") == 0) & (pl.col("remaining") == 0))
+            #     .with_columns(played=pl.col("stats.minutes") > 0)
+            # )
+
+            ollie_player_points = ollie_players_df.join(points_df, on="player_id")
+            # ollie_player_points = ollie_player_points.with_columns(
+            #     unused_starter=((pl.col("position") < 12) & (pl.col("unused"))))
+            # ollie_player_points = apply_substitutions(ollie_player_points)
+            ollie_player_points = ollie_player_points.filter(pl.col("position") < 16).rename(
+                {"stats.total_points": "points"}).sort("position")
+            ollie_player_points = ollie_player_points.with_columns(
+                pl.col("points").mul(pl.col("multiplier")))
+
+            pete_player_points = pete_players_df.join(points_df, on="player_id")
+            # pete_player_points = pete_player_points.with_columns(
+            #     unused_starter=((pl.col("position") < 12) & (pl.col("unused"))))
+            # pete_player_points = apply_substitutions(pete_player_points)
+            pete_player_points = pete_player_points.filter(pl.col("position") < 16).rename(
+                {"stats.total_points": "points"}).sort("position")
+            pete_player_points = pete_player_points.with_columns(
+                pl.col("points").mul(pl.col("multiplier")))
+
             async with self:
+                self.pete_chip, self.pete_transfers_cost = pete_chip, pete_transfers_cost
+                self.ollie_chip, self.ollie_transfers_cost = ollie_chip, ollie_transfers_cost
+
+                self.ollie_starters = ollie_player_points.to_dicts()[:11]
+                self.ollie_subs = ollie_player_points.to_dicts()[11:]
+
+                self.pete_starters = pete_player_points.to_dicts()[:11]
+                self.pete_subs = pete_player_points.to_dicts()[11:]
 
-                with api_client() as client:
-
-                    self.pete_chip, self.pete_transfers_cost = get_entry_extras(
-                        client, PETE_ENTRY_ID, self.gameweek_id)
-
-                    self.ollie_chip, self.ollie_transfers_cost = get_entry_extras(
-                        client, OLLIE_ENTRY_ID, self.gameweek_id)
-
-                    fixtures = get_fixtures(client, self.gameweek_id)
-                    home_fixtures = fixtures.rename({"home_team_id": "team_id"}).select(["team_id", "status"])
-                    away_fixtures = fixtures.rename({"away_team_id": "team_id"}).select(["team_id", "status"])
-
-                    team_fixtures = pl.concat((home_fixtures, away_fixtures)).group_by(
-                        "team_id").agg((pl.col("status") != "FT").sum().alias("remaining"))
-
-                    points_df = get_player_points(client, self.gameweek_id).join(
-                        PLAYERS_DF, on="player_id").join(team_fixtures, on="team_id")
-
-                    # points_df = (
-                    #     points_df.with_columns(
-                    #         unused=(pl.col("stats.minutes") == 0) & (pl.col("remaining") == 0))
-                    #     .with_columns(played=pl.col("stats.minutes") > 0)
-                    # )
-
-                    ollie_players_df = get_entry_picks(client, OLLIE_ENTRY_ID, self.gameweek_id)
-                    ollie_player_points = ollie_players_df.join(points_df, on="player_id")
-                    # ollie_player_points = ollie_player_points.with_columns(
-                    #     unused_starter=((pl.col("position") < 12) & (pl.col("unused"))))
-                    # ollie_player_points = apply_substitutions(ollie_player_points)
-                    ollie_player_points = ollie_player_points.filter(pl.col("position") < 16).rename(
-                        {"stats.total_points": "points"}).sort("position")
-                    ollie_player_points = ollie_player_points.with_columns(
-                        pl.col("points").mul(pl.col("multiplier")))
-
-                    pete_players_df = get_entry_picks(client, PETE_ENTRY_ID, self.gameweek_id)
-                    pete_player_points = pete_players_df.join(points_df, on="player_id")
-                    # pete_player_points = pete_player_points.with_columns(
-                    #     unused_starter=((pl.col("position") < 12) & (pl.col("unused"))))
-                    # pete_player_points = apply_substitutions(pete_player_points)
-                    pete_player_points = pete_player_points.filter(pl.col("position") < 16).rename(
-                        {"stats.total_points": "points"}).sort("position")
-                    pete_player_points = pete_player_points.with_columns(
-                        pl.col("points").mul(pl.col("multiplier")))
-
-                    self.ollie_starters = ollie_player_points.to_dicts()[:11]
-                    self.ollie_subs = ollie_player_points.to_dicts()[11:]
-
-                    self.pete_starters = pete_player_points.to_dicts()[:11]
-                    self.pete_subs = pete_player_points.to_dicts()[11:]
-
-                    self.ollie_total = ollie_player_points["points"].sum()
-                    self.ollie_total -= int(self.ollie_transfers_cost)
-                    self.pete_total = pete_player_points["points"].sum()
-                    self.pete_total -= int(self.pete_transfers_cost)
-                    self.last_updated = datetime.now(ZoneInfo("Europe/London"))
-
-            await asyncio.sleep(60)
+                self.ollie_total = ollie_player_points["points"].sum()
+                self.ollie_total -= int(self.ollie_transfers_cost)
+                self.pete_total = pete_player_points["points"].sum()
+                self.pete_total -= int(self.pete_transfers_cost)
+                self.last_updated = datetime.now(ZoneInfo("Europe/London"))
 
     @rx.event()
     def set_gameweek(self):
@@ -1,12 +1,12 @@
-from concurrent.futures import ThreadPoolExecutor
+import asyncio
 
 import polars as pl
 import reflex as rx
 
 from ..components.league_selector import LeagueSelectState
 from ..components.page_header import page_header
-from ..data.api import (api_client, current_gameweek_id,
-                        get_entry_points_history, get_league_table)
+from ..data.api import (api_client, current_gameweek_id, gather_entries,
+                        get_entry_points_history, iter_league_table)
 from ..templates.template import template
 
 
@@ -26,19 +26,24 @@ class State(rx.State):
 
         if league_selector.selected_league:
 
-            with api_client() as client:
+            client = api_client()
 
-                # get entries in the league
-                league_df = get_league_table(client, league_selector.selected_league.id)
+            entry_ids = []
+            points_history = []
 
-                self.entry_ids = league_df["entry_id"].unique().to_list()
+            # start getting points history for each page of entries in the league as soon as it arrives
+            async for league_df in iter_league_table(client, league_selector.selected_league.id):
+                entry_ids.extend(league_df["entry_id"].to_list())
+                points_history.append(asyncio.ensure_future(gather_entries(
+                    lambda entry_id: get_entry_points_history(client, entry_id), league_df["entry_id"].to_list())))
 
-                # get points from previous gameweek for each entry
-                with ThreadPoolExecutor() as executor:
-                    points_history_df = list(executor.map(lambda entry_id: get_entry_points_history(
-                        client, entry_id), league_df["entry_id"].to_list()))
+            self.entry_ids = list(set(entry_ids))
 
-            points_history_df = (pl.concat(points_history_df)).sort("gameweek_id").group_by("gameweek_id")
+            points_history_df = (
+                pl.concat([df for page in await asyncio.gather(*points_history) for df in page])
+                .sort("gameweek_id")
+                .group_by("gameweek_id")
+            )
 
             data = []
 
@@ -1,6 +1,7 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator
 
+import httpx
 import polars as pl
 import reflex as rx
 from reflex_ag_grid.ag_grid import ColumnDef, ag_grid
@@ -8,75 +9,167 @@ from reflex_ag_grid.ag_grid import ColumnDef, ag_grid
 from ..components.callout import callout
 from ..components.league_selector import LeagueSelectState
 from ..components.page_header import page_header
-from ..data.api import (api_client, current_gameweek_id,
+from ..data.api import (api_client, current_gameweek_id, gather_entries,
                         get_entry_points_history, get_league_picks,
-                        get_league_table, get_player_points)
+                        iter_league_table)
+from ..data.lookup import DenseIndex
+from ..data.poller import poller
+from ..settings import settings
 from ..templates.template import template
 
 
+async def get_entry_points(client: httpx.AsyncClient, gameweek_id: int, league_df: pl.DataFrame, player_points: DenseIndex) -> pl.DataFrame:
+    """
+    Returns the captain, live points and total points for each entry
+    """
+
+    # get players picked for each entry in current gameweek and points from previous gameweek for each entry
+    picked_players_df, prev_gw_points_df = await asyncio.gather(
+        get_league_picks(client, gameweek_id, league_df),
+        gather_entries(lambda entry_id: get_entry_points_history(
+            client, entry_id, gameweek_id-1), league_df["entry_id"].to_list())
+    )
+
+    # get captain for each entry
+    captains_df = (
+        picked_players_df.filter(pl.col("is_captain"))
+        .select(("entry_id", "web_name"))
+        .rename({"web_name": "captain"})
+    )
+
+    prev_gw_points_df = (
+        pl.concat(prev_gw_points_df)
+        .rename({"total_points": "previous_total_points"})
+    )
+
+    # get live points for each entry
+    live_points_df = (
+        player_points.take(picked_players_df)
+        .with_columns(pl.col("stats.total_points").mul(pl.col("multiplier")))
+        .group_by(["entry_id", "manager_name"])
+        .agg(pl.col("stats.total_points").sum().alias("live_points"))
+    )
+
+    # join previous week and live points add total points column for each entry
+    return (
+        prev_gw_points_df.join(live_points_df, on="entry_id")
+        .join(captains_df, on="entry_id")
+        .with_columns(pl.col("previous_total_points").add(pl.col("live_points")).alias("total_points"))
+    )
+
+
+async def iter_entry_points(client: httpx.AsyncClient, gameweek_id: int, league_id: str, player_points_df: pl.DataFrame) -> AsyncIterator[pl.DataFrame]:
+    """
+    Yields the captain, live points and total points for each page of entries in the league as each page completes
+    """
+
+    # look up points for the picks of every page by player id rather than joining each page
+    player_points = DenseIndex(player_points_df.select(("player_id", "stats.total_points")), "player_id")
+
+    # finished tasks for pages of entries and the task reading the pages, in the order they finish
+    finished: asyncio.Queue[asyncio.Future] = asyncio.Queue()
+    entry_points: list[asyncio.Future] = []
+
+    async def read_pages():
+        # start getting points for each page of entries in the league as soon as it arrives, while later pages
+        # are still being read
+        async for league_df in iter_league_table(client, league_id):
+            task = asyncio.ensure_future(get_entry_points(client, gameweek_id, league_df, player_points))
+            task.add_done_callback(finished.put_nowait)
+            entry_points.append(task)
+
+    reader = asyncio.ensure_future(read_pages())
+    reader.add_done_callback(finished.put_nowait)
+
+    read = False
+    completed = 0
+
+    try:
+        while not read or completed < len(entry_points):
+            task = await finished.get()
+
+            if task is reader:
+                read = True
+                # raise any error reading the league
+                task.result()
+            else:
+                completed += 1
+                yield task.result()
+    finally:
+        reader.cancel()
+
+        for task in entry_points:
+            task.cancel()
+
+
 class State(rx.State):
 
     data: list[dict] = []
     gameweek_id: int
 
+    # league whose standings are in data
+    _league_id: str = ""
+
     @rx.event(background=True)
     async def get_data(self):
         """
-        Periodically get latest league standings from the API
+        Get latest league standings each time the shared poller publishes new player points or another league is
+        selected
         """
 
+        version = 0
+
         while True:
-            async with self:
+            # wake up regularly to check for another league being selected while points aren't changing
+            player_points = await poller.subscribe(
+                "player_points", version, timeout=settings.league_check_interval_secs)
+
+            if player_points is None:
+                continue
 
+            # picks are for the gameweek of the points, which may have rolled over since the page was loaded
+            gameweek_id = player_points.gameweek_id
+
+            async with self:
                 league_selector = await self.get_state(LeagueSelectState)
+                selected_league = league_selector.selected_league
+
+                # standings are got again against the latest points for another league
+                if player_points.version == version and (not selected_league or selected_league.id == self._league_id):
+                    continue
+
+                self.gameweek_id = gameweek_id
+
+            version = player_points.version
+
+            if selected_league:
+
+                # show rows as each page of entries completes when the grid has no standings for the league yet,
+                # otherwise keep the previous standings until the refresh is complete
+                async with self:
+                    stream = self._league_id != selected_league.id or not self.data
+
+                df = None
+
+                async for entry_points_df in iter_entry_points(
+                        api_client(), gameweek_id, selected_league.id, player_points.data):
+
+                    df = entry_points_df if df is None else pl.concat([df, entry_points_df])
+
+                    if stream:
+                        async with self:
+                            self.data = df.sort(["total_points", "manager_name"], descending=True).to_dicts()
+                            self._league_id = selected_league.id
+
+                if df is not None and not stream:
+                    async with self:
+                        self.data = df.sort(["total_points", "manager_name"], descending=True).to_dicts()
 
-                if league_selector.selected_league:
-
-                    with api_client() as client:
-
-                        # get entries in the league
-                        league_df = get_league_table(client, league_selector.selected_league.id)
-
-                        # get players picked for each entry in current gameweek
-                        picked_players_df = get_league_picks(client, self.gameweek_id, league_df)
-
-                        # get captain for each entry
-                        captains_df = (
-                            picked_players_df.filter(pl.col("is_captain"))
-                            .select(("entry_id", "web_name"))
-                            .rename({"web_name": "captain"})
-                        )
-
-                        # get points from previous gameweek for each entry
-                        with ThreadPoolExecutor() as executor:
-                            prev_gw_points_df = list(executor.map(lambda entry_id: get_entry_points_history(
-                                client, entry_id, self.gameweek_id-1), league_df["entry_id"].to_list()))
-
-                        prev_gw_points_df = (
-                            pl.concat(prev_gw_points_df)
-                            .rename({"total_points": "previous_total_points"})
-                        )
-
-                        # get live points for each entry
-                        live_points_df = (
-                            picked_players_df
-                            .join(get_player_points(client, self.gameweek_id), on="player_id")
-                            .with_columns(pl.col("stats.total_points").mul(pl.col("multiplier")))
-                            .group_by(["entry_id", "manager_name"])
-                            .agg(pl.col("stats.total_points").sum().alias("live_points"))
-                        )
-
-                    # join previous week and live points add total points column for each entry
-                    df = (
-                        prev_gw_points_df.join(live_points_df, on="entry_id")
-                        .join(captains_df, on="entry_id")
-                        .with_columns(pl.col("previous_total_points").add(pl.col("live_points")).alias("total_points"))
-                        .sort(["total_points", "manager_name"], descending=True)
-                    )
-
-                    self.data = df.to_dicts()
-
-            await asyncio.sleep(5)
+                # a league without any entries replaces the standings of the previous league
+                if df is None and stream:
+                    async with self:
+                        self.data = []
+                        self._league_id = selected_league.id
 
     @rx.event()
     def set_gameweek(self):
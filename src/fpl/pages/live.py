@@ -1,7 +1,6 @@
-import asyncio
+import collections
 import datetime
 
-import polars as pl
 import reflex as rx
 from reflex_ag_grid.ag_grid import ColumnDef, ag_grid
 
@@ -9,55 +8,126 @@ from ..components.callout import callout
 from ..components.league_selector import LeagueSelectState
 from ..components.page_header import page_header
 from ..data.api import (api_client, current_gameweek_id, get_league_picks,
-                        get_league_table, get_player_points,
-                        latest_player_activity)
+                        get_league_table, latest_player_activity)
+from ..data.poller import poller
+from ..settings import settings
 from ..templates.template import template
 
+# grids showing the events on larger screens and as cards on mobile
+GRID_IDS = ("ag-live", "ag-live-cards")
+
 
 class State(rx.State):
 
     gameweek_id: int
+    # events the grids start from when the page loads, later events are sent to the grids as they happen
     live_update_data: list[dict[str, str]] = []
-    player_points_cache: list[dict] = []
     last_refreshed: str
+    # key of the shared player points the latest events were worked out from
+    _points_key: str = ""
+    # league whose picks the events are for
+    _league_id: str = ""
+    # most recent events, newest first
+    _events: collections.deque = collections.deque(maxlen=settings.live_event_log_size)
+    # ids keep increasing as older events drop off the end of the log
+    _next_event_id: int = 0
 
     @rx.event(background=True)
     async def get_data(self):
         """
-        Periodically get latest point scoring events from the API
+        Get latest point scoring events each time the shared poller publishes new player points or another league
+        is selected
         """
 
+        version = 0
+
         while True:
+            # wake up regularly to check for another league being selected while points aren't changing
+            player_points = await poller.subscribe(
+                "player_points", version, timeout=settings.league_check_interval_secs)
 
-            async with self:
+            if player_points is None:
+                continue
+
+            version = player_points.version
 
+            # picks are for the gameweek of the points, which may have rolled over since the page was loaded
+            gameweek_id = player_points.gameweek_id
+
+            async with self:
+                self.gameweek_id = gameweek_id
+                points_key = self._points_key
+                league_id = self._league_id
+                event_id = self._next_event_id
                 league_selector = await self.get_state(LeagueSelectState)
+                selected_league = league_selector.selected_league
+
+            selected_league_id = selected_league.id if selected_league else ""
+
+            if selected_league_id != league_id:
+                # events for players picked in the previous league are cleared and events for the league start from
+                # the latest points
+                previous = None
+            else:
+                # can only work out new points from the previous points the session saw while they are still kept
+                previous = poller.snapshot("player_points", points_key) if points_key else None
 
-                if league_selector.selected_league:
-                    with api_client() as client:
+                # another run of this loop for the session, started by loading the page again, has already recorded
+                # these points
+                if previous and previous.version >= player_points.version:
+                    continue
 
-                        league_df = get_league_table(client, league_selector.selected_league.id)
-                        points_df = get_player_points(client, self.gameweek_id)
-                        picked_players_df = get_league_picks(client, self.gameweek_id, league_df)
+            latest_activity_df = None
 
-                        # points for uniquely selected players for the gameweek
-                        live_player_points_df = (picked_players_df["player_id", "web_name", "position_name", "team_name", "img_url"]
-                                                 .unique()
-                                                 .join(points_df, on="player_id")
-                                                 )
+            if selected_league and previous and previous.gameweek_id == player_points.gameweek_id:
+                client = api_client()
 
-                        # can only work out new points if already have previous points in cache after first run
-                        if self.player_points_cache:
-                            latest_activity_df = latest_player_activity(pl.DataFrame(
-                                self.player_points_cache.copy()), live_player_points_df, len(self.live_update_data))
+                league_df = await get_league_table(client, selected_league.id)
+                picked_players_df = await get_league_picks(client, gameweek_id, league_df)
 
-                            if latest_activity_df is not None:
-                                self.live_update_data = sorted(
-                                    self.live_update_data + latest_activity_df.to_dicts(), key=lambda x: x["id"], reverse=True)
+                # points for uniquely selected players for the gameweek
+                live_player_points_df = (picked_players_df["player_id", "web_name", "position_name", "team_name", "img_url"]
+                                         .unique()
+                                         .join(player_points.data, on="player_id")
+                                         )
 
-                        self.player_points_cache = live_player_points_df.to_dicts()
-                        self.last_refreshed = datetime.datetime.now().strftime("%H:%M:%S")
-            await asyncio.sleep(5)
+                latest_activity_df = latest_player_activity(previous.data, live_player_points_df, event_id)
+
+            added = []
+            removed = []
+
+            async with self:
+                # another run has recorded the events since the points this run started from in the meantime
+                if self._points_key != points_key or self._league_id != league_id:
+                    continue
+
+                if selected_league_id != league_id:
+                    removed = list(self._events)
+                    self._events.clear()
+                    self._league_id = selected_league_id
+
+                if latest_activity_df is not None:
+                    previous_events = list(self._events)
+
+                    # newest event ends up first
+                    self._events.extendleft(latest_activity_df.sort("id").to_dicts())
+                    self._next_event_id = event_id + latest_activity_df.height
+
+                    kept_ids = {event["id"] for event in self._events}
+                    added = [event for event in self._events if event["id"] >= event_id]
+                    removed = [event for event in previous_events if event["id"] not in kept_ids]
+
+                self._points_key = player_points.key
+                self.last_refreshed = datetime.datetime.now().strftime("%H:%M:%S")
+
+            # only send the grids the events that have changed rather than the whole log
+            if added or removed:
+                for grid_id in GRID_IDS:
+                    yield ag_grid.api(grid_id).apply_transaction({
+                        "add": added,
+                        "addIndex": 0,
+                        "remove": [{"id": event["id"]} for event in removed]
+                    })
 
     @rx.event()
     def set_gameweek(self):
@@ -67,6 +137,14 @@ class State(rx.State):
 
         self.gameweek_id = current_gameweek_id()
 
+    @rx.event()
+    def load_events(self):
+        """
+        Sets the events the grids start from to the most recent events
+        """
+
+        self.live_update_data = list(self._events)
+
 
 badge = rx.vars.function.ArgsFunctionOperation.create(
     ("params",),
@@ -153,15 +231,37 @@ def card(data: dict[str, any]) -> rx.Component:
     )
 
 
+card_renderer = rx.vars.function.ArgsFunctionOperation.create(
+    ("params",),
+    card({
+        field: rx.Var(f"params.data.{field}", _var_type=str)
+        for field in ("badge_colour", "event", "img_url", "player", "team", "time", "total_points")
+    }),
+).to(dict)
+
+
 def cards() -> rx.Component:
     """
-    Returns cards showing player point updates
+    Returns an AG Grid showing player point updates as cards
     """
 
-    return rx.flex(
-        rx.foreach(State.live_update_data, card),
-        direction="column",
-        spacing="2",
+    return ag_grid(
+        id="ag-live-cards",
+        column_defs=[
+            ColumnDef(
+                field="id",
+                cell_renderer=card_renderer,
+                flex=1
+            )
+        ],
+        header_height=0,
+        height="calc(100dvh - 240px)",
+        overflow="auto",
+        row_data=State.live_update_data,
+        row_id_key="id",
+        style={"--ag-row-height": "105px !important;"},
+        theme="quartz",
+        width="100%",
     )
 
 
@@ -177,6 +277,7 @@ def grid(mobile: bool) -> rx.Component:
         height="calc(100dvh - 240px)",
         overflow="auto",
         row_data=State.live_update_data,
+        row_id_key="id",
         style={"--ag-row-height": "105px !important;"},
         theme="quartz",
         width="100%",
@@ -194,7 +295,7 @@ def responsive_grid() -> rx.Component:
     )
 
 
-@template(route="/live-updates", title="Live Updates", on_load=[State.set_gameweek, State.get_data])
+@template(route="/live-updates", title="Live Updates", on_load=[State.set_gameweek, State.load_events, State.get_data])
 def live():
     """
     Returns the live points updates page
@@ -1,9 +1,8 @@
-import asyncio
-
 import reflex as rx
 
 from ..components.page_header import page_header
-from ..data.api import api_client, current_gameweek_id, get_fixtures
+from ..data.api import current_gameweek_id
+from ..data.poller import poller
 from ..templates.template import template
 
 
@@ -15,18 +14,17 @@ class State(rx.State):
     @rx.event(background=True)
     async def get_data(self):
         """
-        Periodically get latest scores from the API
+        Get latest scores each time the shared poller publishes them
         """
 
-        while True:
-            async with self:
-                with api_client() as client:
-
-                    fixtures_df = get_fixtures(client, self.gameweek_id)
+        version = 0
 
-                self.data = fixtures_df.to_dicts()
+        while True:
+            fixtures = await poller.subscribe("fixtures", version)
+            version = fixtures.version
 
-            await asyncio.sleep(5)
+            async with self:
+                self.data = fixtures.data.to_dicts()
 
     @rx.event()
     def set_gameweek(self):
@@ -1,4 +1,3 @@
-from concurrent.futures import ThreadPoolExecutor
 from itertools import groupby
 
 import polars as pl
@@ -7,8 +6,8 @@ import reflex as rx
 from ..components.callout import callout
 from ..components.league_selector import LeagueSelectState
 from ..components.page_header import page_header
-from ..data.api import (api_client, current_gameweek_id, get_league_table,
-                        get_transfers)
+from ..data.api import (api_client, current_gameweek_id, gather_entries,
+                        get_league_table, get_transfers)
 from ..templates.template import template
 
 
@@ -23,23 +22,24 @@ class State(rx.State):
         Get latest gameweek transfers from the API
         """
         async with self:
-
+            gameweek_id = self.gameweek_id
             league_selector = await self.get_state(LeagueSelectState)
+            selected_league = league_selector.selected_league
 
-            if league_selector.selected_league:
+        if selected_league:
 
-                with api_client() as client:
+            client = api_client()
 
-                    # get entries in the league
-                    league_df = get_league_table(client, league_selector.selected_league.id)
+            # get entries in the league
+            league_df = await get_league_table(client, selected_league.id)
 
-                    # get trasnfers for current gameweek for each entry
-                    with ThreadPoolExecutor() as executor:
-                        transfers_df = list(executor.map(lambda entry_id: get_transfers(
-                            client, entry_id, self.gameweek_id, league_df), league_df["entry_id"].to_list()))
+            # get trasnfers for current gameweek for each entry
+            transfers_df = await gather_entries(lambda entry_id: get_transfers(
+                client, entry_id, gameweek_id, league_df), league_df["entry_id"].to_list())
 
-                    transfers_df = (pl.concat([df for df in transfers_df if df is not None]))
+            transfers_df = (pl.concat([df for df in transfers_df if df is not None]))
 
+            async with self:
                 for manager, transfers in groupby(transfers_df.to_dicts(), lambda x: x["manager_name"]):
                     self.data[manager] = list(transfers)
 
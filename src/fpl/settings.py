@@ -1,7 +1,70 @@
+import os
 
 
 class Settings():
+    # polling cadence for live data while matches are being played, while waiting for bonus points
+    # to be confirmed and the longest wait between polls otherwise
     refresh_interval_secs: int = 5
+    bonus_interval_secs: int = 5 * 60
+    idle_interval_secs: int = 60 * 60
+
+    # earlier snapshots of live data kept for sessions to compare the latest against, sessions further behind
+    # start comparing again from the latest
+    poller_history_size: int = 12
+
+    # how often pages waiting for new live data check whether another league has been selected
+    league_check_interval_secs: float = 2
+
+    # most recent live events kept for each session, older events drop off the end of the page
+    live_event_log_size: int = 200
+
+    # connection pool for the FPL API client
+    api_base_url: str = "https://fantasy.premierleague.com/api"
+    api_http2: bool = True
+    api_keepalive_expiry_secs: float = 60
+    api_max_connections: int = 20
+    api_max_keepalive_connections: int = 10
+    api_standings_page_window: int = 4
+    api_timeout_secs: float = 10
+    api_warm_connections: int = 2
+
+    # adaptive limit on concurrent requests to the FPL API
+    api_concurrency_initial: int = 10
+    api_concurrency_max: int = 32
+    api_concurrency_min: int = 2
+    api_latency_target_secs: float = 1
+
+    # duplicate requests slower than the latency percentile for their endpoint, capped to a share of all requests
+    api_hedge_budget_ratio: float = 0.05
+    api_hedge_burst: int = 10
+    api_hedge_min_samples: int = 20
+    api_hedge_percentile: float = 0.95
+    api_hedge_requests: bool = True
+    api_hedge_sample_size: int = 200
+
+    # api response cache
+    cache_entry_ttl_secs: float = 60
+    cache_fixtures_ttl_secs: float = 30
+    cache_max_entries: int = 5000
+    cache_standings_ttl_secs: float = 5 * 60
+
+    # how often team, player and gameweek data is refreshed to pick up new players, price and position changes
+    # and rescheduled deadlines, and how often other workers check for a newer version saved by the worker
+    # refreshing it
+    reference_check_interval_secs: float = 10
+    reference_refresh_interval_secs: float = 15 * 60
+
+    # directory the latest team, player and gameweek data is saved to so the app can start without waiting for
+    # the api, revalidating in the background once started
+    reference_path: str = os.getenv("FPL_REFERENCE_PATH", "reference")
+
+    # warming the tracked leagues after each gameweek deadline, once the api has had time to update
+    prefetch_delay_secs: float = 15 * 60
+    prefetch_entries_per_sec: float = 10
+
+    # local database of entry data for gameweeks whose deadline has passed, which should be on a volume that
+    # outlives the container for the data to survive redeploys
+    store_path: str = os.getenv("FPL_STORE_PATH", "fpl.db")
 
 
 settings = Settings()
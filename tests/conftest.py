@@ -0,0 +1,6 @@
+import os
+import sys
+
+# the app runs from src so is imported from there, with its local database kept in memory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("FPL_STORE_PATH", ":memory:")
@@ -0,0 +1,127 @@
+import importlib.util
+import os
+
+import polars as pl
+import pytest
+
+from fpl.data.api import latest_player_activity
+from fpl.data.schemas import LiveStats
+
+# filtering players for each rule in turn, kept in the benchmark as the baseline the single pass replaced
+spec = importlib.util.spec_from_file_location(
+    "benchmark_activity", os.path.join(os.path.dirname(__file__), "..", "benchmarks", "activity.py"))
+benchmark = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(benchmark)
+
+
+
+def player(position: str, player_id: int = 1, **stats: int) -> dict[str, any]:
+    """
+    Returns the points row of a player with the stats, which are otherwise zero
+    """
+
+    return {
+        "player_id": player_id,
+        "web_name": f"{position} Player",
+        "position_name": position,
+        "team_name": "Team",
+        "img_url": "img",
+        **{f"stats.{stat}": stats.get(stat, 0) for stat in LiveStats.__struct_fields__},
+    }
+
+
+def activity(position: str, before: dict[str, int], after: dict[str, int], event_id: int = 0) -> list[tuple]:
+    """
+    Returns the events, points and ids for a player whose stats change from before to after
+    """
+
+    # total points only need to differ for the player to be compared
+    cache = pl.DataFrame([player(position, **before, total_points=1)])
+    latest = pl.DataFrame([player(position, **after, total_points=2)])
+
+    df = latest_player_activity(cache, latest, event_id)
+
+    if df is None:
+        return []
+
+    return list(df.select("id", "event", "points", "badge_colour").iter_rows())
+
+
+def test_brace_is_two_goals():
+    assert activity("Midfielder", {}, {"goals_scored": 2}, event_id=5) == [
+        (5, "Goal Scored", 5, "green"),
+        (6, "Goal Scored", 5, "green"),
+    ]
+
+
+def test_goal_points_by_position():
+    assert activity("Defender", {"goals_scored": 1}, {"goals_scored": 2}) == [(0, "Goal Scored", 6, "green")]
+    assert activity("Forward", {}, {"goals_scored": 1}) == [(0, "Goal Scored", 4, "green")]
+
+
+def test_saves_count_multiples_of_three_crossed():
+    assert activity("Goalkeeper", {"saves": 2}, {"saves": 4}) == [(0, "3 Shots Saved", 1, "green")]
+    assert activity("Goalkeeper", {"saves": 3}, {"saves": 5}) == []
+    assert activity("Goalkeeper", {"saves": 1}, {"saves": 7}) == [
+        (0, "3 Shots Saved", 1, "green"),
+        (1, "3 Shots Saved", 1, "green"),
+    ]
+
+
+def test_goals_conceded_count_multiples_of_two_crossed():
+    assert activity("Defender", {"goals_conceded": 1}, {"goals_conceded": 3}) == [(0, "2 Goals Conceded", -1, "red")]
+    assert activity("Defender", {"goals_conceded": 2}, {"goals_conceded": 3}) == []
+    assert activity("Defender", {"goals_conceded": 0}, {"goals_conceded": 4}) == [
+        (0, "2 Goals Conceded", -1, "red"),
+        (1, "2 Goals Conceded", -1, "red"),
+    ]
+
+
+def test_clean_sheet_gained_and_lost():
+    assert activity("Defender", {}, {"clean_sheets": 1}) == [(0, "Clean Sheet", 4, "green")]
+    assert activity("Midfielder", {"clean_sheets": 1}, {}) == [(0, "Lost Clean Sheet", -1, "red")]
+    assert activity("Goalkeeper", {"clean_sheets": 1}, {"goals_conceded": 1}) == [(0, "Lost Clean Sheet", -4, "red")]
+    # forwards don't score for clean sheets
+    assert activity("Forward", {"clean_sheets": 1}, {}) == []
+
+
+def test_bonus_is_one_event_worth_new_bonus():
+    assert activity("Forward", {}, {"bonus": 3}) == [(0, "Bonus", 3, "green")]
+    assert activity("Forward", {"bonus": 1}, {"bonus": 2}) == [(0, "Bonus", 2, "green")]
+    assert activity("Forward", {"bonus": 2}, {"bonus": 1}) == []
+
+
+def test_events_ordered_by_rule_then_player():
+    cache = pl.DataFrame([player("Defender", 1, total_points=1), player("Midfielder", 2, total_points=1)])
+    latest = pl.DataFrame([
+        player("Defender", 1, goals_scored=1, yellow_cards=1, total_points=6),
+        player("Midfielder", 2, assists=1, goals_scored=1, total_points=9),
+    ])
+
+    df = latest_player_activity(cache, latest, 10)
+
+    assert list(df.select("id", "player", "event", "position", "team", "total_points").iter_rows()) == [
+        (10, "Midfielder Player", "Goal Scored", "Midfielder", "Team", 9),
+        (11, "Defender Player", "Goal Scored", "Defender", "Team", 6),
+        (12, "Midfielder Player", "Goal Assisted", "Midfielder", "Team", 9),
+        (13, "Defender Player", "Yellow Card", "Defender", "Team", 6),
+    ]
+    assert df.columns == [
+        "id", "event", "badge_colour", "img_url", "player", "points", "position", "team", "time", "total_points"
+    ]
+
+
+def test_no_events_when_points_unchanged():
+    cache = pl.DataFrame([player("Defender", goals_scored=1, total_points=1)])
+    latest = pl.DataFrame([player("Defender", goals_scored=2, total_points=1)])
+
+    assert latest_player_activity(cache, latest, 0) is None
+
+
+@pytest.mark.parametrize("players,seed", [(1, 0), (50, 1), (300, 2), (700, 3)])
+def test_matches_per_rule_filters_when_stats_go_up_by_at_most_one(players, seed):
+    cache, latest = benchmark.snapshots(players, seed)
+
+    # the event time is the minute each was worked out in, which can differ between the two
+    assert latest_player_activity(cache, latest, 7).drop("time").equals(
+        benchmark.per_rule(cache, latest, 7).drop("time"))
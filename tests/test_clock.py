@@ -0,0 +1,117 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import polars as pl
+import pytest
+import pytz
+
+from fpl.data import cache, clock
+from fpl.data.clock import GameweekClock
+
+DEADLINES = {
+    1: datetime(2024, 8, 16, 17, 30, tzinfo=pytz.UTC),
+    2: datetime(2024, 8, 24, 10, tzinfo=pytz.UTC),
+    3: datetime(2024, 8, 31, 10, tzinfo=pytz.UTC),
+}
+
+
+def reference(version: int, deadlines: dict[int, datetime]) -> SimpleNamespace:
+    """
+    Returns reference data with the gameweek deadlines
+    """
+
+    return SimpleNamespace(version=version, gameweeks=pl.DataFrame({
+        "gameweek_id": list(deadlines),
+        "deadline_time": list(deadlines.values()),
+        "data_checked": [False] * len(deadlines),
+    }))
+
+
+@pytest.fixture
+def state(monkeypatch) -> SimpleNamespace:
+    """
+    Sets the time the clock sees and the reference data its deadlines are taken from
+    """
+
+    state = SimpleNamespace(time=DEADLINES[1], reference=reference(1, DEADLINES))
+
+    monkeypatch.setattr(clock, "datetime", SimpleNamespace(now=lambda tz: state.time))
+    monkeypatch.setattr(cache.reference_data, "snapshot", lambda: state.reference)
+
+    return state
+
+
+def test_before_first_deadline(state):
+    state.time = datetime(2024, 8, 1, tzinfo=pytz.UTC)
+    gameweek_clock = GameweekClock()
+
+    assert gameweek_clock.current() == 1
+    assert gameweek_clock.next() == 2
+    assert gameweek_clock.next_deadline() == DEADLINES[2]
+
+
+def test_between_deadlines(state):
+    state.time = datetime(2024, 8, 25, tzinfo=pytz.UTC)
+    gameweek_clock = GameweekClock()
+
+    assert gameweek_clock.current() == 2
+    assert gameweek_clock.next() == 3
+    assert gameweek_clock.next_deadline() == DEADLINES[3]
+
+
+def test_after_last_deadline(state):
+    state.time = datetime(2024, 9, 1, tzinfo=pytz.UTC)
+    gameweek_clock = GameweekClock()
+
+    assert gameweek_clock.current() == 3
+    assert gameweek_clock.next() is None
+    assert gameweek_clock.next_deadline() is None
+
+
+def test_rolls_over_when_deadline_passes(state):
+    state.time = datetime(2024, 8, 24, 9, 59, tzinfo=pytz.UTC)
+    gameweek_clock = GameweekClock()
+
+    assert gameweek_clock.current() == 1
+
+    state.time = DEADLINES[2]
+
+    assert gameweek_clock.current() == 2
+
+
+def test_deadline_moved_by_new_reference_version(state):
+    state.time = datetime(2024, 8, 23, tzinfo=pytz.UTC)
+    gameweek_clock = GameweekClock()
+
+    assert gameweek_clock.current() == 1
+    assert gameweek_clock.next_deadline() == DEADLINES[2]
+
+    # gameweek 2 brought forward to before now
+    moved = DEADLINES | {2: datetime(2024, 8, 22, 10, tzinfo=pytz.UTC)}
+    state.reference = reference(2, moved)
+
+    assert gameweek_clock.current() == 2
+    assert gameweek_clock.next_deadline() == DEADLINES[3]
+
+
+def test_subscribers_notified_once_per_rollover(state):
+    state.time = datetime(2024, 8, 20, tzinfo=pytz.UTC)
+    gameweek_clock = GameweekClock()
+    notified = []
+
+    gameweek_clock.subscribe(notified.append)
+
+    for _ in range(3):
+        gameweek_clock.current()
+
+    state.time = datetime(2024, 8, 25, tzinfo=pytz.UTC)
+
+    for _ in range(3):
+        gameweek_clock.current()
+        gameweek_clock.next()
+
+    # a new version with the same deadlines isn't a rollover
+    state.reference = reference(2, DEADLINES)
+    gameweek_clock.current()
+
+    assert notified == [1, 2]
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from fpl.data.hedging import HedgeBudget, LatencyTracker, endpoint, hedged
+
+
+def requests(*attempts: tuple[float, any]):
+    """
+    Returns a request whose attempts each take the seconds before returning the result or raising it if it is an
+    exception, along with the list of attempts made
+    """
+
+    made = []
+
+    async def request():
+        secs, result = attempts[len(made)]
+        made.append(result)
+
+        await asyncio.sleep(secs)
+
+        if isinstance(result, Exception):
+            raise result
+
+        return result
+
+    return request, made
+
+
+def test_hedge_sent_after_threshold_and_faster_response_wins():
+    request, made = requests((1, "primary"), (0, "hedge"))
+    budget = HedgeBudget(ratio=0.05, burst=10)
+
+    assert asyncio.run(asyncio.wait_for(hedged(request, 0.01, budget), 0.5)) == "hedge"
+    assert made == ["primary", "hedge"]
+    assert budget.stats() == {"sent": 1, "won": 1}
+
+
+def test_no_hedge_when_primary_answers_before_threshold():
+    request, made = requests((0, "primary"), (0, "hedge"))
+    budget = HedgeBudget(ratio=0.05, burst=10)
+
+    assert asyncio.run(hedged(request, 0.5, budget)) == "primary"
+    assert made == ["primary"]
+    assert budget.stats() == {"sent": 0, "won": 0}
+
+
+def test_falls_back_to_primary_when_hedge_fails():
+    request, made = requests((0.05, "primary"), (0, RuntimeError("hedge failed")))
+    budget = HedgeBudget(ratio=0.05, burst=10)
+
+    assert asyncio.run(hedged(request, 0.01, budget)) == "primary"
+    assert len(made) == 2
+    assert budget.stats() == {"sent": 1, "won": 0}
+
+
+def test_raises_when_both_fail():
+    request, made = requests((0.05, RuntimeError("primary failed")), (0, RuntimeError("hedge failed")))
+
+    with pytest.raises(RuntimeError, match="primary failed"):
+        asyncio.run(hedged(request, 0.01, HedgeBudget(ratio=0.05, burst=10)))
+
+
+def test_no_hedge_once_budget_spent():
+    budget = HedgeBudget(ratio=0, burst=1)
+
+    request, made = requests((0.05, "primary"), (0, "hedge"))
+    assert asyncio.run(hedged(request, 0.01, budget)) == "hedge"
+
+    request, made = requests((0.05, "primary"), (0, "hedge"))
+    assert asyncio.run(hedged(request, 0.01, budget)) == "primary"
+    assert made == ["primary"]
+    assert budget.stats() == {"sent": 1, "won": 1}
+
+
+def test_budget_earned_back_by_requests():
+    budget = HedgeBudget(ratio=0.5, burst=1)
+
+    assert budget.spend()
+    assert not budget.spend()
+
+    budget.earn()
+    assert not budget.spend()
+
+    budget.earn()
+    assert budget.spend()
+
+
+def test_no_threshold_before_min_samples():
+    latencies = LatencyTracker(sample_size=10, min_samples=3, percentile=0.95)
+    url_endpoint = endpoint("entry/123/event/4/picks/")
+
+    latencies.record(url_endpoint, 0.1)
+    latencies.record(url_endpoint, 0.3)
+
+    assert latencies.threshold(url_endpoint) is None
+
+    latencies.record(url_endpoint, 0.2)
+
+    assert latencies.threshold(url_endpoint) == 0.2
+    # other endpoints keep their own latencies
+    assert latencies.threshold(endpoint("entry/123/history/")) is None
+
+
+def test_no_hedge_without_threshold():
+    request, made = requests((0.05, "primary"), (0, "hedge"))
+
+    assert asyncio.run(hedged(request, None, HedgeBudget(ratio=0.05, burst=10))) == "primary"
+    assert made == ["primary"]
+
+
+def test_endpoint_replaces_ids():
+    assert endpoint("entry/123/event/4/picks/") == "entry/{id}/event/{id}/picks/"
@@ -0,0 +1,85 @@
+import asyncio
+
+import polars as pl
+
+from fpl.data import api
+from fpl.data.history import HistoryStore
+from fpl.data.schemas import Chip, EntryHistory, History
+from fpl.settings import settings
+
+
+def fake_api(monkeypatch, current: int, finalised: int) -> list[str]:
+    """
+    Serves a history with a row for each gameweek up to the current gameweek, returning the urls fetched
+    """
+
+    fetched = []
+
+    async def get_parsed(client, url, type, parse, **kwargs):
+        fetched.append(url)
+        return parse(History(
+            current=[
+                EntryHistory(event=gameweek, points=10, total_points=10 * gameweek, event_transfers_cost=0)
+                for gameweek in range(1, current + 1)
+            ],
+            chips=[Chip(name="wildcard", event=2)]
+        ))
+
+    monkeypatch.setattr(api, "get_parsed", get_parsed)
+    monkeypatch.setattr(api, "current_gameweek_id", lambda: current)
+    monkeypatch.setattr(api, "finalised_gameweek_id", lambda: finalised)
+
+    return fetched
+
+
+def test_refetches_open_gameweek_for_live_callers_after_ttl(monkeypatch):
+    fetched = fake_api(monkeypatch, current=10, finalised=9)
+    monkeypatch.setattr(settings, "cache_entry_ttl_secs", 0)
+    store = HistoryStore()
+
+    async def main():
+        for _ in range(2):
+            await store.get(None, 1)
+
+        assert len(fetched) == 1
+
+        for _ in range(2):
+            await store.get(None, 1, live=True)
+
+        assert len(fetched) == 3
+
+    asyncio.run(main())
+
+
+def test_keeps_history_until_ttl_or_once_finalised(monkeypatch):
+    store = HistoryStore()
+
+    async def main():
+        fetched = fake_api(monkeypatch, current=10, finalised=9)
+        monkeypatch.setattr(settings, "cache_entry_ttl_secs", 60)
+
+        for _ in range(2):
+            await store.get(None, 1, live=True)
+
+        assert len(fetched) == 1
+
+        # finalising the gameweek fetches the final totals once
+        fetched = fake_api(monkeypatch, current=10, finalised=10)
+        monkeypatch.setattr(settings, "cache_entry_ttl_secs", 0)
+
+        for _ in range(2):
+            await store.get(None, 1, live=True)
+
+        assert len(fetched) == 1
+
+    asyncio.run(main())
+
+
+def test_points_history_includes_gameweek_being_played(monkeypatch):
+    fake_api(monkeypatch, current=10, finalised=9)
+    monkeypatch.setattr(api, "history_store", HistoryStore())
+
+    df = asyncio.run(api.get_entry_points_history(None, 1))
+
+    assert df["gameweek_id"].to_list() == list(range(1, 11))
+    assert df.filter(pl.col("gameweek_id") == 10)["total_points"].item() == 100
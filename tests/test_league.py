@@ -0,0 +1,128 @@
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+import polars as pl
+import pytest
+
+from fpl.data import poller as poller_module
+from fpl.data.poller import Poller
+from fpl.settings import settings
+
+league = importlib.import_module("fpl.pages.league")
+
+
+def player_points() -> pl.DataFrame:
+    """
+    Returns live points for one player
+    """
+
+    return pl.DataFrame({"player_id": [1], "stats.total_points": [2]})
+
+
+def test_iter_entry_points_yields_pages_before_league_is_read(monkeypatch):
+    last_page = asyncio.Event()
+
+    async def iter_league_table(client, league_id):
+        yield pl.DataFrame({"entry_id": [1]})
+        # the last page only arrives once the first page has been yielded
+        await last_page.wait()
+        yield pl.DataFrame({"entry_id": [2]})
+
+    async def get_entry_points(client, gameweek_id, league_df, player_points):
+        return league_df
+
+    monkeypatch.setattr(league, "iter_league_table", iter_league_table)
+    monkeypatch.setattr(league, "get_entry_points", get_entry_points)
+
+    async def main():
+        pages = []
+
+        async for entry_points_df in league.iter_entry_points(None, 10, "1", player_points()):
+            pages.append(entry_points_df["entry_id"].to_list())
+            last_page.set()
+
+        return pages
+
+    assert asyncio.run(asyncio.wait_for(main(), 1)) == [[1], [2]]
+
+
+def test_iter_entry_points_raises_error_reading_league(monkeypatch):
+    async def iter_league_table(client, league_id):
+        yield pl.DataFrame({"entry_id": [1]})
+        raise RuntimeError("standings unavailable")
+
+    async def get_entry_points(client, gameweek_id, league_df, player_points):
+        return league_df
+
+    monkeypatch.setattr(league, "iter_league_table", iter_league_table)
+    monkeypatch.setattr(league, "get_entry_points", get_entry_points)
+
+    async def main():
+        return [df async for df in league.iter_entry_points(None, 10, "1", player_points())]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(main())
+
+
+class Session():
+    """
+    Stands in for the state of one session, letting one run of the loop modify it at a time like the state manager
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self.data = []
+        self.gameweek_id = 10
+        self._league_id = ""
+        self.league_selector = SimpleNamespace(selected_league=SimpleNamespace(id="1"))
+
+    async def __aenter__(self):
+        await self._lock.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._lock.release()
+
+    async def get_state(self, state):
+        return self.league_selector
+
+
+def test_league_change_gets_standings_without_new_points(monkeypatch):
+    async def fetch(client, gameweek_id):
+        return player_points()
+
+    async def iter_entry_points(client, gameweek_id, league_id, player_points_df):
+        yield pl.DataFrame({"entry_id": [int(league_id)], "manager_name": ["A"], "total_points": [2]})
+
+    poller = Poller({"player_points": fetch})
+
+    monkeypatch.setattr(poller_module, "api_client", lambda: None)
+    monkeypatch.setattr(poller_module, "current_gameweek_id", lambda: 10)
+    monkeypatch.setattr(league, "api_client", lambda: None)
+    monkeypatch.setattr(league, "iter_entry_points", iter_entry_points)
+    monkeypatch.setattr(league, "poller", poller)
+    monkeypatch.setattr(settings, "league_check_interval_secs", 0.01)
+
+    async def main() -> Session:
+        session = Session()
+        task = asyncio.create_task(league.State.get_data.fn(session))
+
+        await poller.poll()
+
+        while session._league_id != "1":
+            await asyncio.sleep(0.01)
+
+        session.league_selector.selected_league = SimpleNamespace(id="2")
+
+        while session._league_id != "2":
+            await asyncio.sleep(0.01)
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        return session
+
+    session = asyncio.run(asyncio.wait_for(main(), 5))
+
+    assert [row["entry_id"] for row in session.data] == [2]
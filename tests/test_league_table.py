@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from fpl.data import api
+from fpl.data.schemas import LeagueStandings, Standing, Standings
+from fpl.settings import settings
+
+PAGE_SIZE = 50
+
+
+def fake_api(monkeypatch, entries: int) -> list[int]:
+    """
+    Serves the standings of a league with the entries a page at a time like the api, where pages past the last are
+    empty, returning the pages fetched
+    """
+
+    fetched = []
+
+    async def get_parsed(client, url, type, parse, params):
+        page = params["page_standings"]
+        fetched.append(page)
+
+        # let the other pages in the window be requested
+        await asyncio.sleep(0)
+
+        entry_ids = range((page - 1) * PAGE_SIZE + 1, min(page * PAGE_SIZE, entries) + 1)
+
+        return parse(LeagueStandings(standings=Standings(
+            has_next=page * PAGE_SIZE < entries,
+            page=page,
+            results=[Standing(entry=entry_id, player_name="A", entry_name="B", total=0) for entry_id in entry_ids]
+        )))
+
+    monkeypatch.setattr(api, "get_parsed", get_parsed)
+    monkeypatch.setattr(settings, "api_standings_page_window", 4)
+
+    return fetched
+
+
+def league_table(league_id: int = 1) -> list[list[int]]:
+    """
+    Returns the entry ids of each page yielded for the league
+    """
+
+    async def main():
+        return [league_df["entry_id"].to_list() async for league_df in api.iter_league_table(None, league_id)]
+
+    return asyncio.run(main())
+
+
+def test_single_page_league(monkeypatch):
+    fetched = fake_api(monkeypatch, entries=30)
+
+    assert league_table() == [list(range(1, 31))]
+    assert fetched == [1]
+
+
+def test_last_page_inside_window(monkeypatch):
+    fetched = fake_api(monkeypatch, entries=120)
+
+    pages = league_table()
+
+    assert pages[0] == list(range(1, 51))
+    assert sorted(entry_id for page in pages for entry_id in page) == list(range(1, 121))
+    # empty pages after the last aren't yielded
+    assert len(pages) == 3
+    # one window of pages after the first
+    assert sorted(fetched) == [1, 2, 3, 4, 5]
+
+
+def test_last_page_ends_window(monkeypatch):
+    fetched = fake_api(monkeypatch, entries=250)
+
+    assert len(league_table()) == 5
+    assert sorted(fetched) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize("entries,last_fetched", [(320, 9), (450, 9), (460, 13)])
+def test_league_spanning_more_than_one_window(monkeypatch, entries, last_fetched):
+    fetched = fake_api(monkeypatch, entries=entries)
+
+    pages = league_table()
+
+    assert sorted(entry_id for page in pages for entry_id in page) == list(range(1, entries + 1))
+    assert len(pages) == -(-entries // PAGE_SIZE)
+    # windows are requested until one ends with the last page or past it
+    assert sorted(fetched) == list(range(1, last_fetched + 1))
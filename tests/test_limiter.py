@@ -0,0 +1,125 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from fpl.data import limiter as limiter_module
+from fpl.data.limiter import AdaptiveLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch) -> SimpleNamespace:
+    """
+    Sets the monotonic time the limiter sees
+    """
+
+    clock = SimpleNamespace(secs=1000.0)
+
+    monkeypatch.setattr(limiter_module, "time", SimpleNamespace(monotonic=lambda: clock.secs))
+
+    return clock
+
+
+def test_raised_by_one_after_each_healthy_window(clock):
+    limiter = AdaptiveLimiter(initial=4, minimum=2, maximum=32, latency_target_secs=1)
+
+    for _ in range(3):
+        limiter.record(200, 0.5)
+
+    assert limiter.limit == 4
+
+    # a window is as many healthy responses as the limit
+    limiter.record(200, 0.5)
+    assert limiter.limit == 5
+
+    for _ in range(5):
+        limiter.record(200, 0.5)
+
+    assert limiter.limit == 6
+
+
+def test_slow_responses_are_not_healthy(clock):
+    limiter = AdaptiveLimiter(initial=4, minimum=2, maximum=32, latency_target_secs=1)
+
+    for _ in range(8):
+        limiter.record(200, 1.5)
+
+    assert limiter.limit == 4
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 503, None])
+def test_halved_once_per_window_when_failing(clock, status_code):
+    limiter = AdaptiveLimiter(initial=16, minimum=2, maximum=32, latency_target_secs=1)
+
+    # requests already in flight failing together only halve the limit once
+    for _ in range(3):
+        limiter.record(status_code, 0.1)
+
+    assert limiter.limit == 8
+
+    clock.secs += 1
+    limiter.record(status_code, 0.1)
+
+    assert limiter.limit == 4
+
+
+def test_failure_restarts_healthy_window(clock):
+    limiter = AdaptiveLimiter(initial=8, minimum=2, maximum=32, latency_target_secs=1)
+
+    for _ in range(7):
+        limiter.record(200, 0.5)
+
+    limiter.record(429, 0.5)
+
+    for _ in range(3):
+        limiter.record(200, 0.5)
+
+    assert limiter.limit == 4
+
+    limiter.record(200, 0.5)
+    assert limiter.limit == 5
+
+
+def test_stays_within_minimum_and_maximum(clock):
+    limiter = AdaptiveLimiter(initial=3, minimum=2, maximum=4, latency_target_secs=1)
+
+    for _ in range(3):
+        limiter.record(503, 0.1)
+        clock.secs += 1
+
+    assert limiter.limit == 2
+
+    for _ in range(20):
+        limiter.record(200, 0.5)
+
+    assert limiter.limit == 4
+
+
+def test_enter_blocks_at_limit():
+    limiter = AdaptiveLimiter(initial=2, minimum=1, maximum=4, latency_target_secs=1)
+
+    async def request(release: asyncio.Event):
+        async with limiter:
+            await release.wait()
+
+    async def main():
+        releases = [asyncio.Event() for _ in range(3)]
+        requests = [asyncio.create_task(request(release)) for release in releases]
+
+        await asyncio.sleep(0.01)
+
+        assert limiter.stats() == {"limit": 2, "in_flight": 2, "waiting": 1}
+
+        releases[0].set()
+        await asyncio.sleep(0.01)
+
+        assert limiter.stats() == {"limit": 2, "in_flight": 2, "waiting": 0}
+
+        for release in releases:
+            release.set()
+
+        await asyncio.gather(*requests)
+
+        assert limiter.stats() == {"limit": 2, "in_flight": 0, "waiting": 0}
+
+    asyncio.run(asyncio.wait_for(main(), 1))
@@ -0,0 +1,218 @@
+import asyncio
+import collections
+import importlib
+from types import SimpleNamespace
+
+import polars as pl
+import reflex as rx
+
+from fpl.data import poller as poller_module
+from fpl.data.poller import Poller
+from fpl.data.schemas import LiveStats
+from fpl.settings import settings
+
+live = importlib.import_module("fpl.pages.live")
+
+
+
+def player_points(goals: list[int]) -> pl.DataFrame:
+    """
+    Returns live points for two players who have scored the goals
+    """
+
+    return pl.DataFrame({
+        "player_id": [1, 2],
+        **{f"stats.{stat}": [0, 0] for stat in LiveStats.__struct_fields__},
+        "stats.goals_scored": goals,
+        "stats.total_points": [2 + 5 * goal for goal in goals],
+    })
+
+
+class Session():
+    """
+    Stands in for the state of one session, letting one run of the loop modify it at a time like the state manager
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self.gameweek_id = 10
+        self.live_update_data = []
+        self.last_refreshed = ""
+        self._points_key = ""
+        self._league_id = ""
+        self._events = collections.deque(maxlen=settings.live_event_log_size)
+        self._next_event_id = 0
+        self.league_selector = SimpleNamespace(selected_league=SimpleNamespace(id="1"))
+
+    async def __aenter__(self):
+        await self._lock.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._lock.release()
+
+    async def get_state(self, state):
+        return self.league_selector
+
+
+def fake_live(monkeypatch, *snapshots: pl.DataFrame) -> Poller:
+    """
+    Serves the player points a poll at a time and the picks of two players, returning the poller the page
+    subscribes to
+    """
+
+    snapshots = iter(snapshots)
+
+    async def get_league_picks(client, gameweek_id, league_df):
+        # let other runs in while this one is fetching
+        await asyncio.sleep(0)
+        return pl.DataFrame({
+            "player_id": [1, 2],
+            "web_name": ["A", "B"],
+            "position_name": ["Midfielder", "Forward"],
+            "team_name": ["X", "Y"],
+            "img_url": ["a", "b"],
+        })
+
+    async def get_league_table(client, league_id):
+        return pl.DataFrame()
+
+    async def fetch(client, gameweek_id):
+        return next(snapshots)
+
+    poller = Poller({"player_points": fetch})
+
+    monkeypatch.setattr(poller_module, "api_client", lambda: None)
+    monkeypatch.setattr(poller_module, "current_gameweek_id", lambda: 10)
+    monkeypatch.setattr(live, "api_client", lambda: None)
+    monkeypatch.setattr(live, "get_league_picks", get_league_picks)
+    monkeypatch.setattr(live, "get_league_table", get_league_table)
+    monkeypatch.setattr(live, "poller", poller)
+
+    return poller
+
+
+def record_transactions(monkeypatch) -> list[tuple[str, dict]]:
+    """
+    Records the transactions sent to each grid rather than the scripts applying them
+    """
+
+    grid_api = SimpleNamespace(api=lambda grid_id: SimpleNamespace(
+        apply_transaction=lambda transaction: (grid_id, transaction)))
+
+    monkeypatch.setattr(live, "ag_grid", grid_api)
+
+    return []
+
+
+async def wait_for_points(session: Session, poller: Poller):
+    """
+    Polls and waits for the session to record the new points
+    """
+
+    await poller.poll()
+
+    while session._points_key != poller.snapshot("player_points").key:
+        await asyncio.sleep(0)
+
+
+def test_concurrent_runs_emit_each_event_once(monkeypatch):
+    poller = fake_live(monkeypatch, player_points([0, 0]), player_points([1, 0]), player_points([2, 1]))
+    transactions = record_transactions(monkeypatch)
+
+    async def run(session: Session):
+        async for event in live.State.get_data.fn(session):
+            transactions.append(event)
+
+    async def main() -> Session:
+        session = Session()
+        runs = [asyncio.create_task(run(session)) for _ in range(2)]
+
+        for _ in range(3):
+            await wait_for_points(session, poller)
+
+            # let both runs finish the tick
+            for _ in range(20):
+                await asyncio.sleep(0)
+
+        for task in runs:
+            task.cancel()
+
+        await asyncio.gather(*runs, return_exceptions=True)
+
+        return session
+
+    session = asyncio.run(main())
+
+    for grid_id in live.GRID_IDS:
+        added = [event["id"] for id, transaction in transactions if id == grid_id for event in transaction["add"]]
+        assert sorted(added) == [0, 1, 2]
+
+    assert [event["id"] for event in session._events] == [2, 1, 0]
+    assert [event["event"] for event in session._events] == ["Goal Scored", "Goal Scored", "Goal Scored"]
+
+
+def test_league_change_clears_events_without_new_points(monkeypatch):
+    poller = fake_live(monkeypatch, player_points([0, 0]), player_points([1, 0]))
+    transactions = record_transactions(monkeypatch)
+    monkeypatch.setattr(settings, "league_check_interval_secs", 0.01)
+
+    async def run(session: Session):
+        async for event in live.State.get_data.fn(session):
+            transactions.append(event)
+
+    async def main() -> Session:
+        session = Session()
+        task = asyncio.create_task(run(session))
+
+        for _ in range(2):
+            await wait_for_points(session, poller)
+
+        assert [event["id"] for event in session._events] == [0]
+
+        session.league_selector.selected_league = SimpleNamespace(id="2")
+
+        while session._league_id != "2":
+            await asyncio.sleep(0.01)
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        return session
+
+    session = asyncio.run(asyncio.wait_for(main(), 5))
+
+    assert list(session._events) == []
+
+    for grid_id in live.GRID_IDS:
+        removed = [event["id"] for id, transaction in transactions if id == grid_id for event in transaction["remove"]]
+        assert removed == [0]
+
+
+def test_transactions_applied_through_each_grid_api(monkeypatch):
+    poller = fake_live(monkeypatch, player_points([0, 0]), player_points([1, 0]))
+    scripts = []
+
+    async def run(session: Session):
+        async for event in live.State.get_data.fn(session):
+            scripts.append(str(event.args[0][1]))
+
+    async def main():
+        session = Session()
+        task = asyncio.create_task(run(session))
+
+        for _ in range(2):
+            await wait_for_points(session, poller)
+
+        for _ in range(20):
+            await asyncio.sleep(0)
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(asyncio.wait_for(main(), 5))
+
+    assert len(scripts) == len(live.GRID_IDS)
+
+    for grid_id, script in zip(live.GRID_IDS, scripts):
+        assert f"refs['{rx.utils.format.format_ref(grid_id)}']?.current?.api.applyTransaction(" in script
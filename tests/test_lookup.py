@@ -0,0 +1,31 @@
+import polars as pl
+
+from fpl.data.lookup import DenseIndex
+
+PLAYERS = pl.DataFrame({"player_id": [1, 2, 5], "web_name": ["A", "B", "E"]})
+
+
+def test_take_gathers_rows_by_id():
+    index = DenseIndex(PLAYERS, "player_id")
+    df = index.take(pl.DataFrame({"player_id": [5, 1, 5, 2]}))
+
+    assert df["web_name"].to_list() == ["E", "A", "E", "B"]
+
+
+def test_take_gives_nulls_for_missing_and_null_ids():
+    index = DenseIndex(PLAYERS, "player_id")
+    df = index.take(pl.DataFrame({"player_id": [3, None, 9, -1, 2]}))
+
+    assert df["web_name"].to_list() == [None, None, None, None, "B"]
+
+
+def test_take_on_empty_frame_and_all_null_ids():
+    index = DenseIndex(PLAYERS, "player_id")
+
+    empty = index.take(pl.DataFrame({"player_id": []}, schema={"player_id": pl.Int64}))
+    assert empty.columns == ["player_id", "web_name"]
+    assert empty.is_empty()
+
+    nulls = index.take(pl.DataFrame({"id": [None, None]}, schema={"id": pl.Int64}), on="id", suffix="_in")
+    assert nulls.columns == ["id", "web_name_in"]
+    assert nulls["web_name_in"].to_list() == [None, None]
@@ -0,0 +1,89 @@
+import asyncio
+
+import polars as pl
+
+from fpl.data import poller as poller_module
+from fpl.data.poller import Poller
+
+
+def poll(poller: Poller, times: int = 1):
+    async def main():
+        for _ in range(times):
+            await poller.poll()
+
+    asyncio.run(main())
+
+
+def test_snapshot_keys_match_across_workers(monkeypatch):
+    monkeypatch.setattr(poller_module, "api_client", lambda: None)
+    monkeypatch.setattr(poller_module, "current_gameweek_id", lambda: 10)
+
+    points = iter([[2, 6], [2, 7], [2, 7]])
+
+    async def fetch(client, gameweek_id):
+        return pl.DataFrame({"player_id": [1, 2], "stats.total_points": next(points)})
+
+    # the first worker started polling earlier so has a later version of the same points
+    first = Poller({"player_points": fetch})
+    second = Poller({"player_points": fetch})
+    poll(first, 2)
+    poll(second)
+
+    assert first.snapshot("player_points").version != second.snapshot("player_points").version
+
+    key = first.snapshot("player_points").key
+
+    assert key == second.snapshot("player_points").key
+    assert second.snapshot("player_points", key) is second.snapshot("player_points")
+
+
+def test_snapshot_key_changes_with_content_and_gameweek(monkeypatch):
+    gameweeks = iter([10, 10, 11])
+    points = iter([[2, 6], [2, 7], [2, 7]])
+
+    monkeypatch.setattr(poller_module, "api_client", lambda: None)
+    monkeypatch.setattr(poller_module, "current_gameweek_id", lambda: next(gameweeks))
+
+    async def fetch(client, gameweek_id):
+        return pl.DataFrame({"player_id": [1, 2], "stats.total_points": next(points)})
+
+    poller = Poller({"player_points": fetch})
+    poll(poller, 3)
+
+    keys = [snapshot.key for snapshot in poller._history["player_points"]]
+
+    assert len(set(keys)) == 3
+    assert poller.snapshot("player_points", "10-missing") is None
+
+
+def test_keeps_polling_after_a_failed_poll(monkeypatch):
+    gameweeks = iter([RuntimeError("reference data unavailable"), 10])
+
+    def current_gameweek_id():
+        gameweek = next(gameweeks)
+
+        if isinstance(gameweek, Exception):
+            raise gameweek
+
+        return gameweek
+
+    monkeypatch.setattr(poller_module, "api_client", lambda: None)
+    monkeypatch.setattr(poller_module, "current_gameweek_id", current_gameweek_id)
+    monkeypatch.setattr(poller_module, "poll_interval", lambda: 0)
+    monkeypatch.setattr(poller_module.settings, "refresh_interval_secs", 0)
+
+    async def fetch(client, gameweek_id):
+        return pl.DataFrame({"player_id": [1], "stats.total_points": [2]})
+
+    async def main():
+        poller = Poller({"player_points": fetch})
+        poller.start()
+
+        try:
+            snapshot = await asyncio.wait_for(poller.subscribe("player_points"), timeout=1)
+        finally:
+            await poller.stop()
+
+        assert snapshot.gameweek_id == 10
+
+    asyncio.run(main())
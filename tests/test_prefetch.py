@@ -0,0 +1,33 @@
+import asyncio
+
+from fpl.data import prefetch as prefetch_module
+from fpl.data.cache import ReferenceService
+from fpl.data.prefetch import Prefetcher
+
+
+def test_only_leader_prefetches(tmp_path, monkeypatch):
+    async def main():
+        leader = ReferenceService(str(tmp_path))
+        follower = ReferenceService(str(tmp_path))
+        assert leader.lead()
+
+        prefetched = []
+
+        async def prefetch(gameweek_id: int):
+            prefetched.append(gameweek_id)
+
+        for reference_data, expected in ((follower, []), (leader, [11])):
+            monkeypatch.setattr(prefetch_module, "reference_data", reference_data)
+
+            prefetcher = Prefetcher()
+            monkeypatch.setattr(prefetcher, "prefetch", prefetch)
+            prefetcher._league_ids = ["1"]
+            prefetcher._rollover(11)
+            await asyncio.sleep(0)
+
+            assert prefetched == expected
+
+        await leader.stop()
+        await follower.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import pytest
+
+from fpl.data import response_cache as response_cache_module
+from fpl.data.response_cache import ResponseCache
+from fpl.settings import settings
+
+
+@pytest.fixture
+def clock(monkeypatch) -> SimpleNamespace:
+    """
+    Sets the monotonic time the cache sees
+    """
+
+    clock = SimpleNamespace(secs=1000.0)
+
+    monkeypatch.setattr(response_cache_module, "time", SimpleNamespace(monotonic=lambda: clock.secs))
+
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache()
+    cache.put("transfers", "entry/1/transfers/", "data")
+
+    clock.secs += settings.cache_entry_ttl_secs - 1
+    assert cache.get("transfers") == "data"
+
+    clock.secs += 1
+    assert cache.get("transfers") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 0}
+
+
+def test_endpoints_not_listed_are_never_cached(clock):
+    cache = ResponseCache()
+    cache.put("live", "event/10/live/", "data")
+
+    assert cache.get("live") is None
+
+
+def test_least_recently_used_evicted_at_max_entries(clock):
+    cache = ResponseCache(max_entries=2)
+
+    cache.put(1, "entry/1/transfers/", "one")
+    cache.put(2, "entry/2/transfers/", "two")
+
+    # reading the first entry makes the second the least recently used
+    assert cache.get(1) == "one"
+
+    cache.put(3, "entry/3/transfers/", "three")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "one"
+    assert cache.get(3) == "three"
+
+
+def test_future_gameweek_picks_never_cached(clock):
+    cache = ResponseCache()
+    cache.observe_gameweek(10)
+
+    cache.put("picks", "entry/1/event/11/picks/", "data")
+
+    assert cache.get("picks") is None
+
+
+def test_past_and_current_gameweek_picks_kept_forever(clock):
+    cache = ResponseCache()
+    cache.observe_gameweek(10)
+
+    cache.put("past", "entry/1/event/9/picks/", "past")
+    cache.put("current", "entry/1/event/10/picks/", "current")
+
+    clock.secs += 365 * 24 * 60 * 60
+
+    assert cache.get("past") == "past"
+    assert cache.get("current") == "current"
+
+
+def test_rollover_invalidates_entries_for_current_gameweek(clock):
+    cache = ResponseCache()
+    cache.observe_gameweek(10)
+
+    cache.put("past", "entry/1/event/9/picks/", "past")
+    cache.put("current", "entry/1/event/10/picks/", "current")
+    cache.put("transfers", "entry/1/transfers/", "transfers")
+
+    # the same gameweek again isn't a rollover
+    cache.observe_gameweek(10)
+    assert cache.get("transfers") == "transfers"
+
+    # picks for the gameweek rolled back to are dropped along with entries that expire
+    cache.observe_gameweek(9)
+
+    assert cache.get("past") is None
+    assert cache.get("current") is None
+    assert cache.get("transfers") is None
+
+
+def test_rollover_keeps_picks_for_earlier_gameweeks(clock):
+    cache = ResponseCache()
+    cache.observe_gameweek(10)
+
+    cache.put("past", "entry/1/event/9/picks/", "past")
+    cache.put("current", "entry/1/event/10/picks/", "current")
+    cache.put("standings", "leagues-classic/1/standings/", "standings")
+
+    cache.observe_gameweek(11)
+
+    assert cache.get("past") == "past"
+    assert cache.get("current") == "current"
+    assert cache.get("standings") is None
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+import polars as pl
+import pytz
+
+from fpl.data import scheduler
+from fpl.settings import settings
+
+NOW = datetime(2024, 8, 16, 12, tzinfo=pytz.UTC)
+
+
+def fixtures(kickoff_time: datetime) -> pl.DataFrame:
+    """
+    Returns one fixture yet to kick off
+    """
+
+    return pl.DataFrame({
+        "kickoff_time": [kickoff_time.replace(tzinfo=None)],
+        "finished_provisional": [False],
+        "finished": [False],
+    })
+
+
+def test_poll_interval_wakes_at_next_deadline(monkeypatch):
+    monkeypatch.setattr(scheduler.fixture_store, "season", lambda: fixtures(NOW + timedelta(days=1)))
+    monkeypatch.setattr(scheduler.gameweek_clock, "next_deadline", lambda: NOW + timedelta(minutes=10))
+
+    assert scheduler.poll_interval(NOW) == 10 * 60
+
+
+def test_poll_interval_sleeps_until_kickoff_before_deadline(monkeypatch):
+    monkeypatch.setattr(scheduler.fixture_store, "season", lambda: fixtures(NOW + timedelta(minutes=5)))
+    monkeypatch.setattr(scheduler.gameweek_clock, "next_deadline", lambda: NOW + timedelta(minutes=10))
+
+    assert scheduler.poll_interval(NOW) == 5 * 60
+
+
+def test_poll_interval_after_last_deadline(monkeypatch):
+    monkeypatch.setattr(scheduler.fixture_store, "season", lambda: fixtures(NOW - timedelta(days=1)).with_columns(
+        finished_provisional=True, finished=True))
+    monkeypatch.setattr(scheduler.gameweek_clock, "next_deadline", lambda: None)
+
+    assert scheduler.poll_interval(NOW) == settings.idle_interval_secs
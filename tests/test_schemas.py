@@ -0,0 +1,57 @@
+import msgspec
+import polars as pl
+
+from fpl.data.schemas import (EntryGameweek, Live, LiveStats, Pick,
+                              live_to_frame, to_frame)
+
+PICKS_RESPONSE = {
+    "active_chip": "bboost",
+    "automatic_subs": [],
+    "entry_history": {
+        "event": 10,
+        "points": 0,
+        "total_points": 512,
+        "rank": None,
+        "bank": 5,
+        "value": 1003,
+        "event_transfers": 2,
+        "event_transfers_cost": 4,
+        "points_on_bench": 0,
+    },
+    "picks": [
+        {"element": 351, "position": 1, "multiplier": 1, "is_captain": False, "is_vice_captain": False},
+        {"element": 328, "position": 2, "multiplier": 2, "is_captain": True, "is_vice_captain": False},
+    ],
+}
+
+
+def test_entry_gameweek_keeps_only_what_is_fixed_at_the_deadline():
+    entry_gameweek = msgspec.json.decode(msgspec.json.encode(PICKS_RESPONSE), type=EntryGameweek)
+
+    assert entry_gameweek.active_chip == "bboost"
+    assert entry_gameweek.entry_history.event_transfers_cost == 4
+    assert [pick.element for pick in entry_gameweek.picks] == [351, 328]
+    # points change until the gameweek is finalised so aren't kept with the picks
+    assert not hasattr(entry_gameweek.entry_history, "points")
+    assert b"points" not in msgspec.json.encode(entry_gameweek)
+
+
+def test_to_frame_builds_typed_columns():
+    picks = msgspec.json.decode(msgspec.json.encode(PICKS_RESPONSE), type=EntryGameweek).picks
+    df = to_frame(picks, Pick)
+
+    assert df.schema == {"element": pl.Int64, "position": pl.Int64, "multiplier": pl.Int64, "is_captain": pl.Boolean}
+    assert df.rows() == [(351, 1, 1, False), (328, 2, 2, True)]
+    assert to_frame([], Pick).schema == df.schema
+
+
+def test_live_to_frame_flattens_stats():
+    stats = {name: index for index, name in enumerate(LiveStats.__struct_fields__)}
+    live = msgspec.json.decode(msgspec.json.encode({
+        "elements": [{"id": 7, "stats": stats | {"bps": 30}, "explain": []}]
+    }), type=Live)
+
+    df = live_to_frame(live)
+
+    assert df.columns == ["id", *(f"stats.{name}" for name in LiveStats.__struct_fields__)]
+    assert df.row(0) == (7, *stats.values())
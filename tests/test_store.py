@@ -0,0 +1,35 @@
+import asyncio
+
+from fpl.data.schemas import EntryGameweek, EntryGameweekCost, Pick
+from fpl.data.store import EntryStore
+
+
+def entry_gameweek(element: int) -> EntryGameweek:
+    return EntryGameweek(
+        active_chip=None,
+        entry_history=EntryGameweekCost(event_transfers_cost=0),
+        picks=[Pick(element=element, position=1, multiplier=1, is_captain=False)]
+    )
+
+
+def test_reads_entries_saved_by_another_worker(tmp_path):
+    async def main():
+        path = str(tmp_path / "fpl.db")
+        follower = EntryStore(path)
+        leader = EntryStore(path)
+        follower.open()
+        leader.open()
+
+        # the follower has read the gameweek before the leader saved anything for it
+        assert await follower.get("gameweeks", 1, 10) is None
+
+        leader.put("gameweeks", 1, 10, entry_gameweek(351))
+        await leader.close()
+
+        assert await follower.get("gameweeks", 1, 10) == entry_gameweek(351)
+        assert await follower.get("gameweeks", 2, 10) is None
+        assert follower.stats() == {"hits": 1, "misses": 2, "entries": 1}
+
+        await follower.close()
+
+    asyncio.run(main())